@@ -1,8 +1,15 @@
+import json
 import sys
 
 from dotenv import load_dotenv
 
 from app import create_app
+from app.app import start_background_tasks, warm_templates
+from app.core.assets import build_assets
+from app.core.jobs import run_worker
+from app.benchmarks import run_benchmarks
+from app.core.maintenance import run_maintenance_locked
+from app.core.mysql_store import rebuild_finance_ledger
 from app.test_runner import run_tests
 
 load_dotenv()
@@ -20,4 +27,50 @@ if __name__ == "__main__":
         print("Testes OK.")
         sys.exit(0)
 
+    if "--bench" in sys.argv:
+        with app.app_context():
+            report = run_benchmarks()
+        print(json.dumps(report, indent=2))
+        sys.exit(0)
+
+    if "--build-assets" in sys.argv:
+        print(f"Assets gerados: {len(build_assets())}.")
+        sys.exit(0)
+
+    if "--compile-templates" in sys.argv:
+        print(f"Templates compilados: {warm_templates(app)}.")
+        sys.exit(0)
+
+    if "--maintenance" in sys.argv:
+        with app.app_context():
+            report = run_maintenance_locked()
+        if report.get("skipped"):
+            print(f"Manutencao ignorada: {report.get('reason', 'sem banco')}.")
+            sys.exit(1)
+        print(
+            "Manutencao OK: "
+            f"{report['closed_at']} closed_at, {report['projects']} projetos, "
+            f"{report['tasks']} tarefas, {report['finance_entries']} lancamentos."
+        )
+        sys.exit(0)
+
+    if "--rebuild-ledger" in sys.argv:
+        slugs = [arg for arg in sys.argv[1:] if not arg.startswith("--")] or None
+        with app.app_context():
+            report = rebuild_finance_ledger(slugs)
+        if report.get("skipped"):
+            print("Livro-caixa ignorado: sem banco.")
+            sys.exit(1)
+        drifted = ", ".join(report["drifted"]) or "nenhuma"
+        print(f"Livro-caixa OK: {report['missions']} missoes, divergencias: {drifted}.")
+        sys.exit(0)
+
+    if "--worker" in sys.argv:
+        try:
+            run_worker(app)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    start_background_tasks(app)
     app.run(host="0.0.0.0", port=5000)
@@ -1,19 +1,75 @@
+from pathlib import Path
+
 from flask import Flask
+from jinja2 import FileSystemBytecodeCache
 
 from app.config import Config
+from app.core.assets import asset_url
 from app.core.auth import get_current_user
+from app.core.compression import CompressionMiddleware
+from app.core.maintenance import run_maintenance_locked
+from app.core.scheduler import start_periodic_task
+from app.core.warmer import load_snapshot, warm_missions
+from app.routes.api import api_bp
+from app.routes.assets import assets_bp
 from app.routes.health import health_bp
 from app.routes.auth import auth_bp
 from app.routes.public import public_bp
 
 
+def _configure_templates(app: Flask) -> None:
+    cache_dir = app.config.get("JINJA_CACHE_DIR")
+    if cache_dir:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+    if app.config.get("TEMPLATE_WARMUP"):
+        warm_templates(app)
+
+
+def warm_templates(app: Flask) -> int:
+    names = app.jinja_env.list_templates(extensions=["html"])
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+
+def start_background_tasks(app: Flask) -> None:
+    interval = app.config.get("MAINTENANCE_INTERVAL", 0)
+    if interval > 0:
+        start_periodic_task(app, "maintenance", interval, run_maintenance_locked)
+
+    if app.config.get("CACHE_SNAPSHOT_FILE"):
+        with app.app_context():
+            try:
+                load_snapshot()
+            except Exception:
+                app.logger.exception("Falha ao carregar o snapshot do cache.")
+
+    warm_interval = app.config.get("WARM_INTERVAL", 0)
+    if warm_interval > 0:
+        start_periodic_task(app, "cache-warmer", warm_interval, warm_missions)
+
+
 def create_app() -> Flask:
     app = Flask(__name__)
     app.config.from_object(Config)
+    _configure_templates(app)
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(public_bp)
     app.register_blueprint(health_bp)
+    app.register_blueprint(api_bp)
+    app.register_blueprint(assets_bp)
+    app.add_template_global(asset_url)
+
+    if app.config.get("COMPRESS_ENABLED"):
+        app.wsgi_app = CompressionMiddleware(
+            app.wsgi_app,
+            min_size=app.config.get("COMPRESS_MIN_SIZE", 500),
+            level=app.config.get("COMPRESS_LEVEL", 6),
+            brotli_quality=app.config.get("COMPRESS_BROTLI_QUALITY", 4),
+            mimetypes=app.config.get("COMPRESS_MIMETYPES", "").split(","),
+        )
 
     @app.context_processor
     def inject_user():
@@ -0,0 +1,352 @@
+import json
+import tempfile
+import tracemalloc
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from flask import current_app
+from jinja2 import FileSystemBytecodeCache
+
+from app.config import BASE_DIR
+from app.core.cache import (
+    CODEC_JSON,
+    CODEC_MSGPACK,
+    COMPRESSION_LZ4,
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    decode_value,
+    encode_value,
+    lz4_frame,
+    msgpack,
+)
+from app.core.compression import brotli, compress_bytes
+from app.core.finance import Ledger, finance_periods, finance_state
+from app.core.finance_analytics import (
+    BUCKETS_PER_YEAR,
+    HISTORY,
+    bucket_edges,
+    bucket_sums,
+    finance_history,
+    np,
+)
+
+BenchReport = Dict[str, object]
+
+
+def _write_report(report: BenchReport) -> None:
+    reports_dir = BASE_DIR / "instance"
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    report_path = reports_dir / "bench_report.json"
+    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+def _timed(func: Callable[[], object], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def sample_mission(projects: int = 20, tasks: int = 10, entries: int = 500) -> dict:
+    today = date.today()
+    created_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    return {
+        "id": 1,
+        "slug": "benchmark",
+        "name": "Missao de benchmark",
+        "location": "Sao Paulo",
+        "description": "Missao usada para medir o cache.",
+        "verse_text": "Ide por todo o mundo.",
+        "verse_ref": "Marcos 16:15",
+        "meeting_link": "",
+        "updated_at": created_at,
+        "about": {
+            "summary": "Missao usada para medir o cache. " * 8,
+            "mission": "Medir o cache.",
+            "vision": "Paginas rapidas.",
+            "values": [f"Valor {index}" for index in range(6)],
+            "team": "Equipe de benchmark.",
+        },
+        "projects": [
+            {
+                "id": f"projeto-{index}",
+                "title": f"Projeto {index}",
+                "description": f"Descricao do projeto {index}.",
+                "status": "concluida" if index % 4 == 0 else "em_andamento",
+                "meeting_link": "",
+                "budget": 1500.0 + index,
+                "closed_at": (today - timedelta(days=index)).isoformat() if index % 4 == 0 else "",
+                "tasks": [
+                    {
+                        "title": f"Tarefa {index}.{task}",
+                        "status": "concluida" if task % 3 == 0 else "pendente",
+                        "assignee": "",
+                        "weight": 1,
+                    }
+                    for task in range(tasks)
+                ],
+            }
+            for index in range(projects)
+        ],
+        "finance_entries": [
+            {
+                "date": (today - timedelta(days=index % 365)).isoformat(),
+                "type": "entrada" if index % 3 == 0 else "saida",
+                "amount": float(index % 500) + 0.25,
+                "description": f"Lancamento {index}",
+                "category": "Recursos",
+                "receipt_link": "",
+                "project_id": f"projeto-{index % projects}" if projects else "",
+                "created_by": "financeiro@missao.org",
+                "created_at": created_at,
+            }
+            for index in range(entries)
+        ],
+    }
+
+
+def _codec_options() -> List[tuple]:
+    codecs = [("json", CODEC_JSON)]
+    if msgpack is not None:
+        codecs.append(("msgpack", CODEC_MSGPACK))
+    compressions = [("none", COMPRESSION_NONE), ("zlib", COMPRESSION_ZLIB)]
+    if lz4_frame is not None:
+        compressions.append(("lz4", COMPRESSION_LZ4))
+    return [
+        (f"{codec_name}+{compression_name}", codec, compression)
+        for codec_name, codec in codecs
+        for compression_name, compression in compressions
+    ]
+
+
+def bench_codecs(rounds: int = 50) -> BenchReport:
+    samples = {
+        "small": sample_mission(projects=3, tasks=3, entries=20),
+        "large": sample_mission(),
+    }
+    results: BenchReport = {}
+    for sample_name, sample in samples.items():
+        rows = {}
+        for name, codec, compression in _codec_options():
+            def encode() -> bytes:
+                return encode_value(sample, codec, compression, 0)
+
+            raw = encode()
+            rows[name] = {
+                "bytes": len(raw),
+                "encode_ms": round(_timed(encode, rounds), 4),
+                "decode_ms": round(_timed(lambda: decode_value(raw), rounds), 4),
+            }
+        results[sample_name] = rows
+    return results
+
+
+def _compile_templates(bytecode_cache=None) -> float:
+    env = current_app.jinja_env.overlay(cache_size=400, bytecode_cache=bytecode_cache)
+    names = env.list_templates(extensions=["html"])
+    started = time.perf_counter()
+    for name in names:
+        env.get_template(name)
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _first_render(bytecode_cache=None) -> float:
+    env = current_app.jinja_env.overlay(cache_size=400, bytecode_cache=bytecode_cache)
+    mission = sample_mission(entries=0)
+    with current_app.test_request_context("/m/benchmark"):
+        started = time.perf_counter()
+        env.get_template("mission.html").render(mission=mission, current_user=None)
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def bench_templates() -> BenchReport:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        bytecode_cache = FileSystemBytecodeCache(cache_dir)
+        cold_compile = _compile_templates()
+        cold_render = _first_render()
+        _compile_templates(bytecode_cache)
+        return {
+            "compile_all_ms": {
+                "sem_cache": cold_compile,
+                "bytecode_cache": _compile_templates(bytecode_cache),
+            },
+            "primeira_renderizacao_ms": {
+                "sem_cache": cold_render,
+                "bytecode_cache": _first_render(bytecode_cache),
+            },
+        }
+
+
+def _sample_csv(entries: int = 5000) -> bytes:
+    mission = sample_mission(entries=entries)
+    lines = ["date,type,amount,description,project_id"]
+    for entry in mission["finance_entries"]:
+        lines.append(
+            f"{entry['date']},{entry['type']},{entry['amount']},"
+            f"{entry['description']},{entry['project_id']}"
+        )
+    return "\n".join(lines).encode("utf-8")
+
+
+def bench_compression(rounds: int = 20) -> BenchReport:
+    samples = {
+        "json": json.dumps(sample_mission()).encode("utf-8"),
+        "csv": _sample_csv(),
+    }
+    options = [("gzip", level) for level in (1, 6, 9)]
+    if brotli is not None:
+        options += [("br", quality) for quality in (1, 4, 11)]
+    results: BenchReport = {}
+    for sample_name, data in samples.items():
+        rows = {"original_bytes": len(data)}
+        for encoding, level in options:
+            def compress() -> bytes:
+                return compress_bytes(data, encoding, level, level)
+
+            rows[f"{encoding}-{level}"] = {
+                "bytes": len(compress()),
+                "ms": round(_timed(compress, rounds), 3),
+            }
+        results[sample_name] = rows
+    return results
+
+
+def _sample_entries(entries: int) -> List[dict]:
+    return sample_mission(projects=20, tasks=0, entries=entries)["finance_entries"]
+
+
+def _legacy_date(value: str) -> Optional[datetime]:
+    for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S UTC"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _legacy_periods(entries: List[dict]) -> Dict[str, Dict[str, float]]:
+    now = datetime.utcnow()
+    periods = {
+        key: {"total_in": 0.0, "total_out": 0.0}
+        for key in ("daily", "weekly", "monthly", "yearly")
+    }
+    daily_key = now.strftime("%Y-%m-%d")
+    monthly_key = now.strftime("%Y-%m")
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        parsed = _legacy_date(str(entry.get("date", "")))
+        if not parsed:
+            continue
+        try:
+            amount_value = float(entry.get("amount", 0))
+        except (TypeError, ValueError):
+            continue
+        if parsed.strftime("%Y-%m-%d") == daily_key:
+            key = "daily"
+        elif parsed.isocalendar()[:2] == now.isocalendar()[:2]:
+            key = "weekly"
+        elif parsed.strftime("%Y-%m") == monthly_key:
+            key = "monthly"
+        elif parsed.year == now.year:
+            key = "yearly"
+        else:
+            continue
+        field = "total_in" if entry.get("type") == "entrada" else "total_out"
+        periods[key][field] += amount_value
+    for data in periods.values():
+        data["balance"] = data["total_in"] - data["total_out"]
+    return periods
+
+
+def _legacy_state(entries: List[dict], projects: List[dict]) -> Dict[str, object]:
+    total_in = total_out = total_budget = 0.0
+    spent: Dict[str, float] = {}
+    budgets = {}
+    for project in projects:
+        budgets[project["id"]] = float(project.get("budget", 0))
+        total_budget += budgets[project["id"]]
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            amount_value = float(entry.get("amount", 0))
+        except (TypeError, ValueError):
+            continue
+        project_id = entry.get("project_id")
+        if not project_id:
+            if entry.get("type") == "entrada":
+                total_in += amount_value
+            elif entry.get("type") == "saida":
+                total_out += amount_value
+        elif project_id in budgets and entry.get("type") == "saida":
+            spent[project_id] = spent.get(project_id, 0.0) + amount_value
+    return {
+        "available": total_in - total_out - total_budget,
+        "remaining": {key: budget - spent.get(key, 0.0) for key, budget in budgets.items()},
+    }
+
+
+def _python_history(ledger: Ledger, today: date) -> None:
+    for _, granularity, count in HISTORY:
+        edges = bucket_edges(granularity, today, count + BUCKETS_PER_YEAR[granularity])
+        bucket_sums(ledger, edges, vectorized=False)
+
+
+def bench_finance_series(entries: int = 100000, rounds: int = 3) -> BenchReport:
+    sample = _sample_entries(entries)
+    today = date.today()
+    ledger = Ledger.from_entries(sample)
+    report: BenchReport = {
+        "entries": entries,
+        "periods_dict_loop_ms": round(_timed(lambda: _legacy_periods(sample), rounds), 2),
+        "periods_from_dicts_ms": round(_timed(lambda: finance_periods(sample), rounds), 2),
+        "periods_from_ledger_ms": round(_timed(lambda: finance_periods(ledger), rounds), 2),
+        "ledger_build_ms": round(_timed(lambda: Ledger.from_entries(sample), rounds), 2),
+        "history_python_ms": round(_timed(lambda: _python_history(ledger, today), rounds), 2),
+    }
+    if np is not None:
+        report["history_numpy_ms"] = round(
+            _timed(lambda: finance_history(ledger, today), rounds), 2
+        )
+    return report
+
+
+def _traced(build: Callable[[], object]) -> tuple:
+    tracemalloc.start()
+    try:
+        value = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return value, size
+
+
+def bench_ledger(entries: int = 100000, rounds: int = 3) -> BenchReport:
+    projects = sample_mission(projects=20, tasks=0, entries=0)["projects"]
+    sample, dicts_bytes = _traced(lambda: _sample_entries(entries))
+    ledger, ledger_bytes = _traced(lambda: Ledger.from_entries(sample))
+    return {
+        "entries": entries,
+        "dicts_bytes": dicts_bytes,
+        "ledger_bytes": ledger_bytes,
+        "ledger_array_bytes": ledger.nbytes,
+        "state_dict_loop_ms": round(
+            _timed(lambda: _legacy_state(sample, projects), rounds), 2
+        ),
+        "state_from_dicts_ms": round(_timed(lambda: finance_state(sample, projects), rounds), 2),
+        "state_from_ledger_ms": round(_timed(lambda: finance_state(ledger, projects), rounds), 2),
+    }
+
+
+def run_benchmarks() -> BenchReport:
+    report: BenchReport = {
+        "codecs": bench_codecs(),
+        "templates": bench_templates(),
+        "compression": bench_compression(),
+        "finance_series": bench_finance_series(),
+        "ledger": bench_ledger(),
+    }
+    _write_report(report)
+    return report
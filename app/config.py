@@ -13,14 +13,64 @@ class Config:
         os.getenv("FEEDBACK_FILE", BASE_DIR / "instance" / "feedback.json")
     )
     APP_VERSION = os.getenv("APP_VERSION", "0.1.0")
+    JINJA_CACHE_DIR = os.getenv("JINJA_CACHE_DIR", str(BASE_DIR / "instance" / "jinja_cache"))
+    ASSET_MAX_AGE = int(os.getenv("ASSET_MAX_AGE", "31536000"))
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "1") == "1"
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "500"))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+    COMPRESS_MIMETYPES = os.getenv(
+        "COMPRESS_MIMETYPES",
+        "text/html,text/css,text/csv,text/plain,application/json,"
+        "application/x-ndjson,application/javascript",
+    )
+    TEMPLATE_WARMUP = os.getenv("TEMPLATE_WARMUP", "1") == "1"
     DATA_BACKEND = os.getenv("DATA_BACKEND", "mysql")
     MYSQL_HOST = os.getenv("MYSQL_HOST", "localhost")
     MYSQL_PORT = int(os.getenv("MYSQL_PORT", "3306"))
     MYSQL_USER = os.getenv("MYSQL_USER", "")
     MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "")
     MYSQL_DB = os.getenv("MYSQL_DB", "")
+    MYSQL_IN_CHUNK = int(os.getenv("MYSQL_IN_CHUNK", "500"))
     REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
     REDIS_DB = int(os.getenv("REDIS_DB", "0"))
     REDIS_TTL_MISSION = int(os.getenv("REDIS_TTL_MISSION", "600"))
     REDIS_TTL_LIST = int(os.getenv("REDIS_TTL_LIST", "120"))
+    REDIS_TTL_MISSING = int(os.getenv("REDIS_TTL_MISSING", "30"))
+    IGNORED_SUBDOMAINS = os.getenv("IGNORED_SUBDOMAINS", "www,api,admin,mail,static,cdn")
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "16"))
+    REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "0.5"))
+    REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "0.25"))
+    REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.25"))
+    CACHE_BREAKER_FAILURES = int(os.getenv("CACHE_BREAKER_FAILURES", "5"))
+    CACHE_BREAKER_COOLDOWN = float(os.getenv("CACHE_BREAKER_COOLDOWN", "30"))
+    FINANCE_EXPORT_BATCH = int(os.getenv("FINANCE_EXPORT_BATCH", "1000"))
+    CACHE_L1_SIZE = int(os.getenv("CACHE_L1_SIZE", "512"))
+    CACHE_L1_TTL = int(os.getenv("CACHE_L1_TTL", "15"))
+    WARM_INTERVAL = int(os.getenv("WARM_INTERVAL", "300"))
+    WARM_TOP = int(os.getenv("WARM_TOP", "20"))
+    CACHE_SNAPSHOT_FILE = os.getenv("CACHE_SNAPSHOT_FILE", "")
+    CACHE_SNAPSHOT_MAX_AGE = int(os.getenv("CACHE_SNAPSHOT_MAX_AGE", "900"))
+    MISSION_MEMO_SIZE = int(os.getenv("MISSION_MEMO_SIZE", "256"))
+    CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", "60"))
+    CACHE_LOCK_TTL = int(os.getenv("CACHE_LOCK_TTL", "10"))
+    CACHE_LOCK_WAIT = float(os.getenv("CACHE_LOCK_WAIT", "2.0"))
+    CACHE_XFETCH_BETA = float(os.getenv("CACHE_XFETCH_BETA", "1.0"))
+    CACHE_CODEC = os.getenv("CACHE_CODEC", "json")
+    CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "zlib")
+    CACHE_COMPRESS_MIN = int(os.getenv("CACHE_COMPRESS_MIN", "1024"))
+    PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "1") == "1"
+    PAGE_CACHE_INDEX_TTL = int(os.getenv("PAGE_CACHE_INDEX_TTL", "60"))
+    PUBLIC_PAGE_MAX_AGE = int(os.getenv("PUBLIC_PAGE_MAX_AGE", "0"))
+    CHAT_PAGE_SIZE = int(os.getenv("CHAT_PAGE_SIZE", "50"))
+    REPORTS_PAGE_SIZE = int(os.getenv("REPORTS_PAGE_SIZE", "20"))
+    FINANCE_PAGE_SIZE = int(os.getenv("FINANCE_PAGE_SIZE", "50"))
+    JOBS_ENABLED = os.getenv("JOBS_ENABLED", "0") == "1"
+    JOB_TTL = int(os.getenv("JOB_TTL", "86400"))
+    JOB_BLOCK_TIMEOUT = int(os.getenv("JOB_BLOCK_TIMEOUT", "5"))
+    JOB_TIMEOUT = int(os.getenv("JOB_TIMEOUT", "900"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    MAINTENANCE_INTERVAL = int(os.getenv("MAINTENANCE_INTERVAL", "0"))
+    MAINTENANCE_BATCH = int(os.getenv("MAINTENANCE_BATCH", "500"))
+    MAINTENANCE_LOCK_TTL = int(os.getenv("MAINTENANCE_LOCK_TTL", "900"))
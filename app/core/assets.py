@@ -0,0 +1,92 @@
+import gzip
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from flask import current_app, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = Path(__file__).resolve().parents[1] / "static"
+DIST_DIR = STATIC_DIR / "dist"
+MANIFEST_NAME = "manifest.json"
+ASSET_EXTENSIONS = {".css", ".js", ".svg"}
+
+_MANIFEST: Optional[Dict[str, str]] = None
+_MANIFEST_LOCK = threading.Lock()
+
+
+def _hashed_name(relative: Path, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return relative.with_name(f"{relative.stem}.{digest}{relative.suffix}").as_posix()
+
+
+def _write_variants(target: Path, content: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(content)
+    gzip_path = target.with_name(target.name + ".gz")
+    gzip_path.write_bytes(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        brotli_path = target.with_name(target.name + ".br")
+        brotli_path.write_bytes(brotli.compress(content, quality=11))
+
+
+def build_assets(static_dir: Path = STATIC_DIR, dist_dir: Path = DIST_DIR) -> Dict[str, str]:
+    manifest: Dict[str, str] = {}
+    for path in sorted(static_dir.rglob("*")):
+        if not path.is_file() or dist_dir in path.parents:
+            continue
+        if path.suffix not in ASSET_EXTENSIONS:
+            continue
+        relative = path.relative_to(static_dir)
+        content = path.read_bytes()
+        hashed = _hashed_name(relative, content)
+        target = dist_dir / hashed
+        if not target.exists():
+            _write_variants(target, content)
+        manifest[relative.as_posix()] = hashed
+    dist_dir.mkdir(parents=True, exist_ok=True)
+    (dist_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    reset_manifest()
+    return manifest
+
+
+def reset_manifest() -> None:
+    global _MANIFEST
+    with _MANIFEST_LOCK:
+        _MANIFEST = None
+
+
+def _manifest() -> Dict[str, str]:
+    global _MANIFEST
+    if _MANIFEST is not None:
+        return _MANIFEST
+    with _MANIFEST_LOCK:
+        if _MANIFEST is None:
+            try:
+                data = json.loads((DIST_DIR / MANIFEST_NAME).read_text(encoding="utf-8"))
+            except (FileNotFoundError, ValueError):
+                data = {}
+            _MANIFEST = data if isinstance(data, dict) else {}
+    return _MANIFEST
+
+
+def asset_version() -> str:
+    manifest = _manifest()
+    return hashlib.sha1(json.dumps(manifest, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def asset_url(filename: str) -> str:
+    hashed = _manifest().get(filename)
+    if hashed is None:
+        return url_for("static", filename=filename)
+    return url_for("assets.asset", filename=hashed)
+
+
+def asset_max_age() -> int:
+    return int(current_app.config.get("ASSET_MAX_AGE", 31536000))
@@ -1,10 +1,120 @@
 import json
-from typing import Optional
+import math
+import os
+import random
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 import redis
 from flask import current_app
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
 _CLIENT = None
+_BLOCKING_CLIENT = None
+_SUBSCRIBER_PID = None
+_SUBSCRIBER_LOCK = threading.Lock()
+
+
+class LocalCache:
+    def __init__(self) -> None:
+        self._items: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[object]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: object, ttl: float, max_size: int) -> None:
+        if max_size <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > max_size:
+                self._items.popitem(last=False)
+
+    def drop(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_LOCAL = LocalCache()
+
+
+class _CircuitBreaker:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+        self._counters = {"errors": 0, "trips": 0, "skipped": 0}
+
+    def is_open(self) -> bool:
+        return self._open_until > time.monotonic()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if not self.is_open():
+                return True
+            self._counters["skipped"] += 1
+            return False
+
+    def success(self) -> None:
+        with self._lock:
+            self._failures = 0
+
+    def failure(self, threshold: int, cooldown: float) -> None:
+        with self._lock:
+            self._counters["errors"] += 1
+            self._failures += 1
+            if self._failures < threshold:
+                return
+            self._failures = 0
+            self._open_until = time.monotonic() + cooldown
+            self._counters["trips"] += 1
+        _LOCAL.clear()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                **self._counters,
+                "state": "open" if self.is_open() else "closed",
+                "pending_invalidations": len(_PENDING),
+            }
+
+
+_BREAKER = _CircuitBreaker()
+_PENDING: Dict[str, str] = {}
+_PENDING_LOCK = threading.Lock()
 
 
 def _client() -> redis.Redis:
@@ -12,32 +122,510 @@ def _client() -> redis.Redis:
     if _CLIENT is not None:
         return _CLIENT
     config = current_app.config
-    _CLIENT = redis.Redis(
+    pool = redis.BlockingConnectionPool(
         host=config.get("REDIS_HOST"),
         port=config.get("REDIS_PORT"),
         db=config.get("REDIS_DB"),
-        decode_responses=True,
+        max_connections=int(config.get("REDIS_MAX_CONNECTIONS", 16)),
+        timeout=float(config.get("REDIS_POOL_TIMEOUT", 0.5)),
+        socket_connect_timeout=float(config.get("REDIS_CONNECT_TIMEOUT", 0.25)),
+        socket_timeout=float(config.get("REDIS_SOCKET_TIMEOUT", 0.25)),
     )
+    _CLIENT = redis.Redis(connection_pool=pool, decode_responses=False)
     return _CLIENT
 
 
-def cache_get(key: str) -> Optional[dict]:
-    client = _client()
-    raw = client.get(key)
+def _subscriber_client() -> redis.Redis:
+    config = current_app.config
+    return redis.Redis(
+        host=config.get("REDIS_HOST"),
+        port=config.get("REDIS_PORT"),
+        db=config.get("REDIS_DB"),
+        socket_connect_timeout=float(config.get("REDIS_CONNECT_TIMEOUT", 0.25)),
+        decode_responses=False,
+    )
+
+
+def _blocking_client() -> redis.Redis:
+    global _BLOCKING_CLIENT
+    if _BLOCKING_CLIENT is None:
+        _BLOCKING_CLIENT = _subscriber_client()
+    return _BLOCKING_CLIENT
+
+
+def _redis_call(
+    operation: Callable[[redis.Redis], object],
+    fallback: object = None,
+    client: Optional[redis.Redis] = None,
+) -> object:
+    if not _BREAKER.allow():
+        return fallback
+    try:
+        result = operation(client or _client())
+    except redis.RedisError:
+        config = current_app.config
+        _BREAKER.failure(
+            int(config.get("CACHE_BREAKER_FAILURES", 5)),
+            float(config.get("CACHE_BREAKER_COOLDOWN", 30)),
+        )
+        current_app.logger.warning("Redis indisponivel; usando o banco diretamente.")
+        return fallback
+    _BREAKER.success()
+    if _PENDING:
+        _replay_invalidations()
+    return result
+
+
+def _defer_invalidation(key: str, operation: str) -> None:
+    with _PENDING_LOCK:
+        if _PENDING.get(key) != "incr":
+            _PENDING[key] = operation
+
+
+def _replay_invalidations() -> None:
+    with _PENDING_LOCK:
+        pending = dict(_PENDING)
+        _PENDING.clear()
+    try:
+        client = _client()
+        for key, operation in pending.items():
+            if operation == "incr":
+                client.set(key, _counter_seed(), nx=True)
+                client.incr(key)
+            else:
+                client.delete(key)
+        _publish_invalidation(client, list(pending))
+    except redis.RedisError:
+        for key, operation in pending.items():
+            _defer_invalidation(key, operation)
+
+
+def cache_available() -> bool:
+    return not _BREAKER.is_open()
+
+
+def cache_ping() -> bool:
+    return bool(_redis_call(lambda client: client.ping(), False))
+
+
+def cache_stats() -> Dict[str, object]:
+    return _BREAKER.stats()
+
+
+def _local_settings() -> Tuple[int, int]:
+    config = current_app.config
+    return int(config.get("CACHE_L1_SIZE", 512)), int(config.get("CACHE_L1_TTL", 15))
+
+
+def _local_set(key: str, value: object, ttl: Optional[int] = None) -> None:
+    max_size, local_ttl = _local_settings()
+    if max_size <= 0:
+        return
+    _ensure_subscriber()
+    _LOCAL.set(key, value, min(local_ttl, ttl or local_ttl), max_size)
+
+
+def _listen_invalidations(client: redis.Redis) -> None:
+    while True:
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            _LOCAL.clear()
+            for message in pubsub.listen():
+                try:
+                    keys = json.loads(message.get("data") or "[]")
+                except (TypeError, json.JSONDecodeError):
+                    _LOCAL.clear()
+                    continue
+                _LOCAL.drop(keys)
+        except redis.RedisError:
+            _LOCAL.clear()
+            time.sleep(1)
+        finally:
+            pubsub.close()
+
+
+def _ensure_subscriber() -> None:
+    global _SUBSCRIBER_PID
+    if _SUBSCRIBER_PID == os.getpid():
+        return
+    with _SUBSCRIBER_LOCK:
+        if _SUBSCRIBER_PID == os.getpid():
+            return
+        _LOCAL.clear()
+        thread = threading.Thread(
+            target=_listen_invalidations,
+            args=(_subscriber_client(),),
+            name="cache-invalidations",
+            daemon=True,
+        )
+        thread.start()
+        _SUBSCRIBER_PID = os.getpid()
+
+
+CODEC_MAGIC = b"\x01"
+CODEC_JSON = b"j"
+CODEC_MSGPACK = b"m"
+COMPRESSION_NONE = b"-"
+COMPRESSION_ZLIB = b"z"
+COMPRESSION_LZ4 = b"4"
+
+
+def _encode_default(value: object) -> object:
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Tipo nao suportado no cache: {type(value).__name__}")
+
+
+def _serialize(value: object, codec: bytes) -> bytes:
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(value, default=_encode_default, use_bin_type=True)
+    return json.dumps(value, default=_encode_default, separators=(",", ":")).encode("utf-8")
+
+
+def _deserialize(body: bytes, codec: bytes) -> object:
+    if codec == CODEC_MSGPACK:
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    return json.loads(body)
+
+
+def _compress(body: bytes, compression: bytes) -> bytes:
+    if compression == COMPRESSION_LZ4:
+        return lz4_frame.compress(body)
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(body, 6)
+    return body
+
+
+def _decompress(body: bytes, compression: bytes) -> bytes:
+    if compression == COMPRESSION_LZ4:
+        return lz4_frame.decompress(body)
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(body)
+    return body
+
+
+def _codec_settings() -> Tuple[bytes, bytes, int]:
+    config = current_app.config
+    codec = CODEC_JSON
+    if config.get("CACHE_CODEC") == "msgpack" and msgpack is not None:
+        codec = CODEC_MSGPACK
+    compression = COMPRESSION_NONE
+    if config.get("CACHE_COMPRESSION") == "lz4" and lz4_frame is not None:
+        compression = COMPRESSION_LZ4
+    elif config.get("CACHE_COMPRESSION") in {"zlib", "lz4"}:
+        compression = COMPRESSION_ZLIB
+    return codec, compression, int(config.get("CACHE_COMPRESS_MIN", 1024))
+
+
+def encode_value(
+    value: object,
+    codec: bytes = CODEC_JSON,
+    compression: bytes = COMPRESSION_NONE,
+    compress_min: int = 1024,
+) -> bytes:
+    body = _serialize(value, codec)
+    if compression == COMPRESSION_NONE or len(body) < compress_min:
+        return CODEC_MAGIC + codec + COMPRESSION_NONE + body
+    return CODEC_MAGIC + codec + compression + _compress(body, compression)
+
+
+def decode_value(raw: Optional[bytes]) -> Optional[object]:
     if not raw:
         return None
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        if raw[:1] != CODEC_MAGIC:
+            return json.loads(raw)
+        codec, compression = raw[1:2], raw[2:3]
+        return _deserialize(_decompress(raw[3:], compression), codec)
+    except Exception:
         return None
 
 
+def _encode(value: object) -> bytes:
+    codec, compression, compress_min = _codec_settings()
+    return encode_value(value, codec, compression, compress_min)
+
+
+def cache_get(key: str, local: bool = True) -> Optional[dict]:
+    if local:
+        cached = _LOCAL.get(key)
+        if cached is not None:
+            return cached
+    value = decode_value(_redis_call(lambda client: client.get(key)))
+    if value is not None:
+        _local_set(key, value)
+    return value
+
+
+def cache_get_many(keys: List[str], local: bool = True) -> List[Optional[dict]]:
+    if not keys:
+        return []
+    values: Dict[str, Optional[dict]] = {
+        key: _LOCAL.get(key) if local else None for key in keys
+    }
+    missing = [key for key, value in values.items() if value is None]
+    if missing:
+        raws = _redis_call(lambda client: client.mget(missing), [None] * len(missing))
+        for key, raw in zip(missing, raws):
+            value = decode_value(raw)
+            values[key] = value
+            if value is not None:
+                _local_set(key, value)
+    return [values[key] for key in keys]
+
+
 def cache_set(key: str, value: dict, ttl: int) -> None:
-    client = _client()
-    client.setex(key, ttl, json.dumps(value))
+    raw = _encode(value)
+    _redis_call(lambda client: client.setex(key, ttl, raw))
+    _local_set(key, decode_value(raw), ttl)
+
+
+def _publish_invalidation(client: redis.Redis, keys: List[str]) -> None:
+    client.publish(INVALIDATION_CHANNEL, json.dumps(keys))
 
 
 def cache_delete(*keys: str) -> None:
-    client = _client()
-    if keys:
+    if not keys:
+        return
+    _LOCAL.drop(keys)
+
+    def delete(client: redis.Redis) -> bool:
         client.delete(*keys)
+        _publish_invalidation(client, list(keys))
+        return True
+
+    if not _redis_call(delete, False):
+        for key in keys:
+            _defer_invalidation(key, "delete")
+
+
+def _counter_seed() -> int:
+    return int(time.time() * 1000)
+
+
+def cache_counters(keys: List[str]) -> List[int]:
+    if not keys:
+        return []
+    seed = _counter_seed()
+
+    def init(client: redis.Redis) -> List[Optional[bytes]]:
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.set(key, seed, nx=True)
+            pipe.get(key)
+        return pipe.execute()[1::2]
+
+    values = [int(raw or 0) for raw in _redis_call(init, [None] * len(keys))]
+    for key, value in zip(keys, values):
+        if value:
+            _local_set(key, value)
+    return values
+
+
+def cache_incr(key: str) -> int:
+    _LOCAL.drop([key])
+
+    def incr(client: redis.Redis) -> int:
+        pipe = client.pipeline(transaction=False)
+        pipe.set(key, _counter_seed(), nx=True)
+        pipe.incr(key)
+        value = int(pipe.execute()[1])
+        _publish_invalidation(client, [key])
+        return value
+
+    value = int(_redis_call(incr, 0))
+    if not value:
+        _defer_invalidation(key, "incr")
+    return value
+
+
+def cache_set_nx(key: str, value: object, ttl: int) -> bool:
+    raw = _encode(value)
+    return bool(_redis_call(lambda client: client.set(key, raw, nx=True, ex=max(int(ttl), 1))))
+
+
+def cache_zincr_many(key: str, counts: Dict[str, int], keep: int = 0) -> None:
+    if not counts:
+        return
+
+    def zincr(client: redis.Redis) -> None:
+        pipe = client.pipeline(transaction=False)
+        for member, amount in counts.items():
+            pipe.zincrby(key, amount, member)
+        if keep > 0:
+            pipe.zremrangebyrank(key, 0, -keep - 1)
+        pipe.execute()
+
+    _redis_call(zincr)
+
+
+def cache_top(key: str, limit: int) -> List[str]:
+    members = _redis_call(lambda client: client.zrevrange(key, 0, limit - 1), [])
+    return [member.decode("utf-8") for member in members]
+
+
+def cache_push(key: str, value: str) -> bool:
+    return bool(_redis_call(lambda client: client.lpush(key, value), 0))
+
+
+def cache_claim(source: str, target: str, timeout: int) -> Optional[str]:
+    item = _redis_call(
+        lambda client: client.brpoplpush(source, target, timeout), client=_blocking_client()
+    )
+    return item.decode("utf-8") if item else None
+
+
+def cache_list(key: str) -> List[str]:
+    items = _redis_call(lambda client: client.lrange(key, 0, -1), [])
+    return [item.decode("utf-8") for item in items]
+
+
+def cache_list_remove(key: str, value: str) -> bool:
+    return bool(_redis_call(lambda client: client.lrem(key, 1, value), 0))
+
+
+_UNLOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def cache_lock(key: str, ttl: int) -> Optional[str]:
+    token = uuid.uuid4().hex
+    if _redis_call(lambda client: client.set(key, token, nx=True, ex=max(int(ttl), 1))):
+        return token
+    return None
+
+
+def cache_unlock(key: str, token: str) -> None:
+    _redis_call(lambda client: client.eval(_UNLOCK_SCRIPT, 1, key, token))
+
+
+Builder = Callable[[List[str]], Dict[str, Optional[dict]]]
+
+
+def _lock_key(key: str) -> str:
+    return f"lock:{key}"
+
+
+def _is_envelope(cached: Optional[dict]) -> bool:
+    return isinstance(cached, dict) and "value" in cached and "expires" in cached
+
+
+def _needs_refresh(envelope: dict, now: float) -> bool:
+    beta = float(current_app.config.get("CACHE_XFETCH_BETA", 1.0))
+    delta = float(envelope.get("delta") or 0)
+    early = delta * beta * -math.log(max(random.random(), 1e-12))
+    return now + early >= float(envelope["expires"])
+
+
+def _build(
+    keys: List[str], builder: Builder, ttl: int, tokens: Dict[str, str]
+) -> Dict[str, Optional[dict]]:
+    stale_ttl = int(current_app.config.get("CACHE_STALE_TTL", 60))
+    try:
+        started = time.time()
+        values = builder(keys)
+        delta = time.time() - started
+        for key in keys:
+            value = values.get(key)
+            if value is None:
+                continue
+            envelope = {"value": value, "expires": time.time() + ttl, "delta": delta}
+            cache_set(key, envelope, ttl + stale_ttl)
+        return {key: values.get(key) for key in keys}
+    finally:
+        for key, token in tokens.items():
+            cache_unlock(_lock_key(key), token)
+
+
+def _wait_for(keys: List[str], builder: Builder, ttl: int) -> Dict[str, Optional[dict]]:
+    config = current_app.config
+    deadline = time.monotonic() + float(config.get("CACHE_LOCK_WAIT", 2.0))
+    poll = float(config.get("CACHE_LOCK_POLL", 0.05))
+    results: Dict[str, Optional[dict]] = {}
+    pending = list(keys)
+    while pending and time.monotonic() < deadline:
+        time.sleep(poll)
+        still_pending = []
+        for key, cached in zip(pending, cache_get_many(pending, local=False)):
+            if _is_envelope(cached):
+                results[key] = cached["value"]
+            elif _redis_call(lambda client: client.exists(_lock_key(key))):
+                still_pending.append(key)
+        built_elsewhere = set(results)
+        abandoned = [
+            key for key in pending if key not in built_elsewhere and key not in still_pending
+        ]
+        if abandoned:
+            results.update(_build(abandoned, builder, ttl, {}))
+        pending = still_pending
+    if pending:
+        results.update(_build(pending, builder, ttl, {}))
+    return results
+
+
+def _refresh(
+    claimed: Dict[str, str], stale: Dict[str, dict], builder: Builder, ttl: int
+) -> Dict[str, Optional[dict]]:
+    try:
+        values = _build(list(claimed), builder, ttl, claimed)
+    except Exception:
+        if not set(claimed).issubset(stale):
+            raise
+        current_app.logger.exception("Falha ao reconstruir cache; servindo valor anterior.")
+        return {key: stale[key] for key in claimed}
+    return {
+        key: value if value is not None else stale.get(key)
+        for key, value in values.items()
+    }
+
+
+def cache_get_or_build_many(
+    keys: List[str], builder: Builder, ttl: int
+) -> Dict[str, Optional[dict]]:
+    lock_ttl = int(current_app.config.get("CACHE_LOCK_TTL", 10))
+    now = time.time()
+    results: Dict[str, Optional[dict]] = {}
+    claimed: Dict[str, str] = {}
+    stale: Dict[str, dict] = {}
+    waiting: List[str] = []
+    direct: List[str] = []
+    cached_values = cache_get_many(keys)
+    available = cache_available()
+    for key, cached in zip(keys, cached_values):
+        if _is_envelope(cached):
+            if not available or not _needs_refresh(cached, now):
+                results[key] = cached["value"]
+                continue
+            stale[key] = cached["value"]
+        if not available:
+            direct.append(key)
+            continue
+        token = cache_lock(_lock_key(key), lock_ttl)
+        if token is not None:
+            claimed[key] = token
+        elif key in stale:
+            results[key] = stale[key]
+        else:
+            waiting.append(key)
+    if direct:
+        results.update(_build(direct, builder, ttl, {}))
+    if claimed:
+        results.update(_refresh(claimed, stale, builder, ttl))
+    if waiting:
+        results.update(_wait_for(waiting, builder, ttl))
+    return results
+
+
+def cache_get_or_build(
+    key: str, builder: Callable[[], Optional[dict]], ttl: int
+) -> Optional[dict]:
+    return cache_get_or_build_many([key], lambda _: {key: builder()}, ttl).get(key)
@@ -0,0 +1,161 @@
+import gzip
+import zlib
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+Headers = List[Tuple[str, str]]
+
+DEFAULT_MIMETYPES = (
+    "text/html",
+    "text/css",
+    "text/csv",
+    "text/plain",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+)
+SKIP_STATUSES = {"204", "206", "304"}
+
+
+class _Encoder:
+    def __init__(self, encoding: str, level: int, brotli_quality: int) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress_bytes(data: bytes, encoding: str, level: int = 6, brotli_quality: int = 4) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = parse_accept_header(accept_encoding)
+    if brotli is not None and accepted["br"] > 0:
+        return "br"
+    if accepted["gzip"] > 0:
+        return "gzip"
+    return None
+
+
+def _header(headers: Headers, name: str) -> Optional[str]:
+    lowered = name.lower()
+    return next((value for key, value in headers if key.lower() == lowered), None)
+
+
+def _without(headers: Headers, *names: str) -> Headers:
+    lowered = {name.lower() for name in names}
+    return [(key, value) for key, value in headers if key.lower() not in lowered]
+
+
+def _with_vary(headers: Headers) -> Headers:
+    vary = _header(headers, "Vary")
+    if vary and "accept-encoding" in vary.lower():
+        return headers
+    value = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+    return _without(headers, "Vary") + [("Vary", value)]
+
+
+def _weak_etag(headers: Headers) -> Headers:
+    etag = _header(headers, "ETag")
+    if not etag or etag.startswith("W/"):
+        return headers
+    return _without(headers, "ETag") + [("ETag", f"W/{etag}")]
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: Callable,
+        min_size: int = 500,
+        level: int = 6,
+        brotli_quality: int = 4,
+        mimetypes: Iterable[str] = DEFAULT_MIMETYPES,
+    ) -> None:
+        self.app = app
+        self.min_size = min_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.mimetypes = {mimetype.strip() for mimetype in mimetypes if mimetype.strip()}
+
+    def _compressible(self, status: str, headers: Headers) -> bool:
+        mimetype = (_header(headers, "Content-Type") or "").split(";")[0].strip()
+        cache_control = (_header(headers, "Cache-Control") or "").lower()
+        return (
+            status.split(" ")[0] not in SKIP_STATUSES
+            and mimetype in self.mimetypes
+            and _header(headers, "Content-Encoding") is None
+            and "no-transform" not in cache_control
+        )
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        encoding = negotiate_encoding(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None or environ.get("REQUEST_METHOD") == "HEAD":
+            return self.app(environ, start_response)
+
+        deferred = {}
+
+        def defer(status: str, headers: Headers, exc_info=None):
+            deferred.update(status=status, headers=headers, exc_info=exc_info)
+            return lambda data: None
+
+        body = self.app(environ, defer)
+        status, headers = deferred["status"], deferred["headers"]
+        if not self._compressible(status, headers):
+            start_response(status, headers, deferred["exc_info"])
+            return body
+
+        headers = _with_vary(headers)
+        length = _header(headers, "Content-Length")
+        if length is not None and int(length) < self.min_size:
+            start_response(status, headers, deferred["exc_info"])
+            return body
+
+        headers = _weak_etag(_without(headers, "Content-Length")) + [
+            ("Content-Encoding", encoding)
+        ]
+        if length is not None:
+            try:
+                data = b"".join(body)
+            finally:
+                if hasattr(body, "close"):
+                    body.close()
+            compressed = compress_bytes(data, encoding, self.level, self.brotli_quality)
+            start_response(
+                status, headers + [("Content-Length", str(len(compressed)))], deferred["exc_info"]
+            )
+            return [compressed]
+
+        start_response(status, headers, deferred["exc_info"])
+        return self._stream(body, _Encoder(encoding, self.level, self.brotli_quality))
+
+    def _stream(self, body: Iterable[bytes], encoder: _Encoder) -> Iterator[bytes]:
+        try:
+            for data in body:
+                if data:
+                    chunk = encoder.chunk(data)
+                    if chunk:
+                        yield chunk
+            yield encoder.finish()
+        finally:
+            if hasattr(body, "close"):
+                body.close()
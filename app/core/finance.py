@@ -1,5 +1,9 @@
-from datetime import datetime
-from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from operator import itemgetter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
 FinanceEntry = Dict[str, object]
 
@@ -7,6 +11,11 @@ ENTRY_TYPE_IN = "entrada"
 ENTRY_TYPE_OUT = "saida"
 ALLOWED_TYPES = {ENTRY_TYPE_IN, ENTRY_TYPE_OUT}
 
+TYPE_OTHER = 0
+TYPE_IN = 1
+TYPE_OUT = 2
+_TYPE_FLAGS = {ENTRY_TYPE_IN: TYPE_IN, ENTRY_TYPE_OUT: TYPE_OUT}
+
 
 def parse_amount(raw_value: str) -> Optional[float]:
     normalized = raw_value.replace(".", "").replace(",", ".")
@@ -51,54 +60,106 @@ def build_finance_entry(
     return entry, None
 
 
-def finance_summary(entries: Iterable[FinanceEntry]) -> Dict[str, float]:
-    total_in = 0.0
-    total_out = 0.0
-    for entry in entries:
-        if not isinstance(entry, dict):
-            continue
-        amount = entry.get("amount", 0)
-        try:
-            amount_value = float(amount)
-        except (TypeError, ValueError):
-            continue
-        if entry.get("type") == ENTRY_TYPE_IN:
-            total_in += amount_value
-        elif entry.get("type") == ENTRY_TYPE_OUT:
-            total_out += amount_value
+def to_cents(value: object) -> Optional[int]:
+    if isinstance(value, Decimal):
+        return int((value * 100).to_integral_value())
+    try:
+        return int(round(float(value) * 100))
+    except (TypeError, ValueError):
+        return None
 
+
+def _entry_ordinal(value: object) -> int:
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return 0
+
+
+class Ledger:
+    __slots__ = ("ordinals", "cents", "flags", "projects", "project_ids")
+
+    def __init__(self, ordinals, cents, flags, projects, project_ids: List[str]) -> None:
+        self.ordinals = ordinals
+        self.cents = cents
+        self.flags = flags
+        self.projects = projects
+        self.project_ids = project_ids
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[FinanceEntry]) -> "Ledger":
+        codes = {"": 0}
+        rows = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            cents = to_cents(entry.get("amount", 0))
+            if cents is None:
+                continue
+            code = codes.setdefault(entry.get("project_id") or "", len(codes))
+            flag = _TYPE_FLAGS.get(entry.get("type"), TYPE_OTHER)
+            rows.append((_entry_ordinal(entry.get("date", "")), cents, flag, code))
+        rows.sort(key=itemgetter(0))
+        ordinals, cents, flags, projects = zip(*rows) if rows else ((), (), (), ())
+        return cls(
+            array("i", ordinals),
+            array("q", cents),
+            array("b", flags),
+            array("I", projects),
+            list(codes),
+        )
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            memoryview(column).nbytes
+            for column in (self.ordinals, self.cents, self.flags, self.projects)
+        )
+
+    def between(self, start: Optional[date] = None, end: Optional[date] = None) -> "Ledger":
+        low = 0 if start is None else bisect_left(self.ordinals, start.toordinal())
+        high = len(self) if end is None else bisect_left(self.ordinals, end.toordinal())
+        columns = (self.ordinals, self.cents, self.flags, self.projects)
+        return Ledger(*(memoryview(column)[low:high] for column in columns), self.project_ids)
+
+    def sums(self) -> List[List[int]]:
+        totals = [0] * (len(self.project_ids) * 3)
+        for cents, flag, project in zip(self.cents, self.flags, self.projects):
+            totals[project * 3 + flag] += cents
+        return [totals[index : index + 3] for index in range(0, len(totals), 3)]
+
+
+def _as_ledger(entries: Union[Ledger, Iterable[FinanceEntry]]) -> Ledger:
+    if isinstance(entries, Ledger):
+        return entries
+    return Ledger.from_entries(entries)
+
+
+def _summary_payload(cents_in: int, cents_out: int) -> Dict[str, float]:
     return {
-        "total_in": total_in,
-        "total_out": total_out,
-        "balance": total_in - total_out,
+        "total_in": cents_in / 100,
+        "total_out": cents_out / 100,
+        "balance": (cents_in - cents_out) / 100,
     }
 
 
-def sort_entries(entries: Iterable[FinanceEntry]) -> List[FinanceEntry]:
-    def sort_key(item: FinanceEntry) -> Tuple[str, str]:
-        date_value = str(item.get("date", ""))
-        created_at = str(item.get("created_at", ""))
-        return date_value, created_at
-
-    return sorted(
-        [entry for entry in entries if isinstance(entry, dict)],
-        key=sort_key,
-        reverse=True,
+def finance_summary(entries: Union[Ledger, Iterable[FinanceEntry]]) -> Dict[str, float]:
+    sums = _as_ledger(entries).sums()
+    return _summary_payload(
+        sum(row[TYPE_IN] for row in sums), sum(row[TYPE_OUT] for row in sums)
     )
 
 
-def finance_state(
-    entries: Iterable[FinanceEntry], projects: Iterable[Dict[str, object]]
-) -> Dict[str, object]:
-    central_entries = [
-        entry
-        for entry in entries
-        if isinstance(entry, dict) and not entry.get("project_id")
-    ]
-    central_summary = finance_summary(central_entries)
-
+def _project_budgets(
+    projects: Iterable[Dict[str, object]]
+) -> Tuple[Dict[str, Dict[str, object]], float]:
     project_map = {}
-    total_budget = 0.0
+    budget_cents = 0
     for project in projects:
         if not isinstance(project, dict):
             continue
@@ -110,7 +171,7 @@ def finance_state(
             budget_value = float(budget)
         except (TypeError, ValueError):
             budget_value = 0.0
-        total_budget += budget_value
+        budget_cents += to_cents(budget_value)
         project_map[project_id] = {
             "id": project_id,
             "title": project.get("title", project_id),
@@ -119,27 +180,21 @@ def finance_state(
             "status": project.get("status", ""),
             "closed_at": project.get("closed_at", ""),
         }
+    return project_map, budget_cents / 100
 
-    for entry in entries:
-        if not isinstance(entry, dict):
-            continue
-        project_id = entry.get("project_id")
-        if not project_id or project_id not in project_map:
-            continue
-        try:
-            amount_value = float(entry.get("amount", 0))
-        except (TypeError, ValueError):
-            continue
-        if entry.get("type") == ENTRY_TYPE_OUT:
-            project_map[project_id]["spent"] += amount_value
 
+def _state_payload(
+    central_summary: Dict[str, float],
+    project_map: Dict[str, Dict[str, object]],
+    total_budget: float,
+) -> Dict[str, object]:
     projects_state = []
     for project in project_map.values():
-        remaining = project["budget"] - project["spent"]
-        project["remaining"] = remaining
+        remaining = to_cents(project["budget"]) - to_cents(project["spent"])
+        project["remaining"] = remaining / 100
         projects_state.append(project)
 
-    available = central_summary["balance"] - total_budget
+    available = (to_cents(central_summary["balance"]) - to_cents(total_budget)) / 100
 
     return {
         "central": central_summary,
@@ -149,59 +204,112 @@ def finance_state(
     }
 
 
-def _parse_entry_date(value: str) -> Optional[datetime]:
-    for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S UTC"):
-        try:
-            return datetime.strptime(value, fmt)
-        except ValueError:
-            continue
-    return None
+def finance_state(
+    entries: Union[Ledger, Iterable[FinanceEntry]], projects: Iterable[Dict[str, object]]
+) -> Dict[str, object]:
+    ledger = _as_ledger(entries)
+    sums = ledger.sums()
+    central_summary = _summary_payload(sums[0][TYPE_IN], sums[0][TYPE_OUT])
 
+    project_map, total_budget = _project_budgets(projects)
+    for project_id, row in zip(ledger.project_ids[1:], sums[1:]):
+        if project_id in project_map:
+            project_map[project_id]["spent"] = row[TYPE_OUT] / 100
 
-def finance_periods(entries: Iterable[FinanceEntry]) -> Dict[str, Dict[str, float]]:
-    now = datetime.utcnow()
-    daily_key = now.strftime("%Y-%m-%d")
-    weekly_key = f"{now.year}-W{now.isocalendar().week:02d}"
-    monthly_key = now.strftime("%Y-%m")
-    yearly_key = str(now.year)
-
-    periods = {
-        "daily": {"key": daily_key, "total_in": 0.0, "total_out": 0.0},
-        "weekly": {"key": weekly_key, "total_in": 0.0, "total_out": 0.0},
-        "monthly": {"key": monthly_key, "total_in": 0.0, "total_out": 0.0},
-        "yearly": {"key": yearly_key, "total_in": 0.0, "total_out": 0.0},
+    return _state_payload(central_summary, project_map, total_budget)
+
+
+def finance_state_from_totals(
+    totals: Mapping[str, object], projects: Iterable[Dict[str, object]]
+) -> Dict[str, object]:
+    central = totals.get("central", {})
+    central_summary = _summary_payload(
+        int(central.get("cents_in", 0)), int(central.get("cents_out", 0))
+    )
+
+    project_map, total_budget = _project_budgets(projects)
+    for project_id, spent_cents in totals.get("project_spent", {}).items():
+        if project_id in project_map:
+            project_map[project_id]["spent"] = int(spent_cents) / 100
+
+    return _state_payload(central_summary, project_map, total_budget)
+
+
+def period_bounds(now: datetime) -> Dict[str, Tuple[date, date]]:
+    today = now.date()
+    week_start = today - timedelta(days=today.isocalendar()[2] - 1)
+    month_start = today.replace(day=1)
+    if month_start.month == 12:
+        next_month = month_start.replace(year=month_start.year + 1, month=1)
+    else:
+        next_month = month_start.replace(month=month_start.month + 1)
+    year_start = today.replace(month=1, day=1)
+    return {
+        "daily": (today, today + timedelta(days=1)),
+        "weekly": (week_start, week_start + timedelta(days=7)),
+        "monthly": (month_start, next_month),
+        "yearly": (year_start, year_start.replace(year=year_start.year + 1)),
     }
 
-    for entry in entries:
-        if not isinstance(entry, dict):
-            continue
-        date_str = str(entry.get("date", ""))
-        parsed = _parse_entry_date(date_str)
-        if not parsed:
-            continue
-        try:
-            amount_value = float(entry.get("amount", 0))
-        except (TypeError, ValueError):
-            continue
 
-        is_in = entry.get("type") == ENTRY_TYPE_IN
-        if parsed.strftime("%Y-%m-%d") == daily_key:
-            key = "daily"
-        elif parsed.isocalendar()[:2] == now.isocalendar()[:2]:
-            key = "weekly"
-        elif parsed.strftime("%Y-%m") == monthly_key:
-            key = "monthly"
-        elif parsed.year == now.year:
-            key = "yearly"
-        else:
-            continue
+def _empty_periods(now: datetime) -> Dict[str, Dict[str, float]]:
+    return {
+        "daily": {"key": now.strftime("%Y-%m-%d"), "total_in": 0.0, "total_out": 0.0},
+        "weekly": {
+            "key": f"{now.year}-W{now.isocalendar().week:02d}",
+            "total_in": 0.0,
+            "total_out": 0.0,
+        },
+        "monthly": {"key": now.strftime("%Y-%m"), "total_in": 0.0, "total_out": 0.0},
+        "yearly": {"key": str(now.year), "total_in": 0.0, "total_out": 0.0},
+    }
+
+
+def _flows(ledger: Ledger, start: date, end: date) -> Tuple[int, int]:
+    if start >= end:
+        return 0, 0
+    sums = ledger.between(start, end).sums()
+    return (
+        sum(row[TYPE_IN] for row in sums),
+        sum(row[TYPE_OTHER] + row[TYPE_OUT] for row in sums),
+    )
+
 
-        if is_in:
-            periods[key]["total_in"] += amount_value
-        else:
-            periods[key]["total_out"] += amount_value
+def _overlap(first: Tuple[date, date], second: Tuple[date, date]) -> Tuple[date, date]:
+    return max(first[0], second[0]), min(first[1], second[1])
+
+
+def finance_periods(
+    entries: Union[Ledger, Iterable[FinanceEntry]]
+) -> Dict[str, Dict[str, float]]:
+    now = datetime.utcnow()
+    ledger = _as_ledger(entries)
+    bounds = period_bounds(now)
+    recent = (
+        min(bounds["weekly"][0], bounds["monthly"][0]),
+        max(bounds["weekly"][1], bounds["monthly"][1]),
+    )
+    claimed_earlier = {
+        "daily": (bounds["daily"][0], bounds["daily"][0]),
+        "weekly": bounds["daily"],
+        "monthly": _overlap(bounds["monthly"], bounds["weekly"]),
+        "yearly": _overlap(bounds["yearly"], recent),
+    }
+    periods = _empty_periods(now)
+    for key, (start, end) in bounds.items():
+        cents_in, cents_out = _flows(ledger, start, end)
+        claimed_in, claimed_out = _flows(ledger, *claimed_earlier[key])
+        periods[key].update(_summary_payload(cents_in - claimed_in, cents_out - claimed_out))
+    return periods
 
-    for data in periods.values():
-        data["balance"] = data["total_in"] - data["total_out"]
 
+def finance_periods_from_totals(
+    buckets: Mapping[str, Mapping[str, object]], now: datetime
+) -> Dict[str, Dict[str, float]]:
+    periods = _empty_periods(now)
+    for key, data in periods.items():
+        totals = buckets.get(key, {})
+        data.update(
+            _summary_payload(int(totals.get("cents_in", 0)), int(totals.get("cents_out", 0)))
+        )
     return periods
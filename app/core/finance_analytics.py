@@ -0,0 +1,147 @@
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+from app.core.finance import TYPE_IN, Ledger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SeriesPoint = Dict[str, object]
+
+GRANULARITIES = ("day", "week", "month", "year")
+BUCKETS_PER_YEAR = {"day": 364, "week": 52, "month": 12, "year": 1}
+HISTORY = (("monthly", "month", 12), ("weekly", "week", 52))
+
+
+def bucket_start(granularity: str, day: date) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def _advance(granularity: str, start: date, steps: int) -> date:
+    if granularity == "week":
+        return start + timedelta(days=7 * steps)
+    if granularity == "month":
+        index = start.year * 12 + start.month - 1 + steps
+        return date(index // 12, index % 12 + 1, 1)
+    if granularity == "year":
+        return start.replace(year=start.year + steps)
+    return start + timedelta(days=steps)
+
+
+def bucket_edges(granularity: str, end: date, count: int) -> List[date]:
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Granularidade invalida: {granularity}")
+    first = _advance(granularity, bucket_start(granularity, end), 1 - count)
+    return [_advance(granularity, first, step) for step in range(count + 1)]
+
+
+def bucket_key(granularity: str, start: date) -> str:
+    if granularity == "week":
+        year, week, _ = start.isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == "month":
+        return start.strftime("%Y-%m")
+    if granularity == "year":
+        return str(start.year)
+    return start.isoformat()
+
+
+def _numpy_sums(ledger: Ledger, bounds: List[int]) -> Tuple[List[int], List[int]]:
+    ordinals = np.frombuffer(ledger.ordinals, dtype=np.int32)
+    positions = np.searchsorted(ordinals, bounds)
+    low, high = int(positions[0]), int(positions[-1])
+    cents = np.frombuffer(ledger.cents, dtype=np.int64)[low:high]
+    incoming = np.frombuffer(ledger.flags, dtype=np.int8)[low:high] == TYPE_IN
+    cents_in = np.where(incoming, cents, 0)
+    running_in = np.concatenate(([0], np.cumsum(cents_in)))
+    running_out = np.concatenate(([0], np.cumsum(cents - cents_in)))
+    positions = positions - low
+    return (
+        (running_in[positions[1:]] - running_in[positions[:-1]]).tolist(),
+        (running_out[positions[1:]] - running_out[positions[:-1]]).tolist(),
+    )
+
+
+def _python_sums(ledger: Ledger, bounds: List[int]) -> Tuple[List[int], List[int]]:
+    view = ledger.between(date.fromordinal(bounds[0]), date.fromordinal(bounds[-1]))
+    totals_in = [0] * (len(bounds) - 1)
+    totals_out = [0] * (len(bounds) - 1)
+    index = 0
+    for ordinal, cents, flag in zip(view.ordinals, view.cents, view.flags):
+        while ordinal >= bounds[index + 1]:
+            index += 1
+        if flag == TYPE_IN:
+            totals_in[index] += cents
+        else:
+            totals_out[index] += cents
+    return totals_in, totals_out
+
+
+def bucket_sums(
+    ledger: Ledger, edges: List[date], vectorized: bool = True
+) -> Tuple[List[int], List[int]]:
+    bounds = [edge.toordinal() for edge in edges]
+    if vectorized and np is not None:
+        return _numpy_sums(ledger, bounds)
+    return _python_sums(ledger, bounds)
+
+
+def _point(granularity: str, start: date, cents_in: int, cents_out: int) -> SeriesPoint:
+    return {
+        "key": bucket_key(granularity, start),
+        "start": start.isoformat(),
+        "total_in": cents_in / 100,
+        "total_out": cents_out / 100,
+        "balance": (cents_in - cents_out) / 100,
+    }
+
+
+def finance_series(ledger: Ledger, granularity: str, end: date, count: int) -> List[SeriesPoint]:
+    edges = bucket_edges(granularity, end, count)
+    totals_in, totals_out = bucket_sums(ledger, edges)
+    return [
+        _point(granularity, start, cents_in, cents_out)
+        for start, cents_in, cents_out in zip(edges, totals_in, totals_out)
+    ]
+
+
+def series_range(granularity: str, end: date, count: int) -> Tuple[date, date]:
+    edges = bucket_edges(granularity, end, count + BUCKETS_PER_YEAR[granularity])
+    return edges[0], edges[-1]
+
+
+def year_over_year(ledger: Ledger, granularity: str, end: date, count: int) -> List[SeriesPoint]:
+    offset = BUCKETS_PER_YEAR[granularity]
+    series = finance_series(ledger, granularity, end, count + offset)
+    points = []
+    for previous, current in zip(series, series[offset:]):
+        point = dict(current)
+        point.update(
+            previous_key=previous["key"],
+            previous_in=previous["total_in"],
+            previous_out=previous["total_out"],
+            previous_balance=previous["balance"],
+        )
+        points.append(point)
+    return points
+
+
+def history_range(end: date) -> Tuple[date, date]:
+    ranges = [series_range(granularity, end, count) for _, granularity, count in HISTORY]
+    return min(start for start, _ in ranges), max(stop for _, stop in ranges)
+
+
+def finance_history(ledger: Ledger, end: date) -> Dict[str, List[SeriesPoint]]:
+    return {
+        name: year_over_year(ledger, granularity, end, count)
+        for name, granularity, count in HISTORY
+    }
+
@@ -0,0 +1,188 @@
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from flask import Flask, current_app
+
+from app.core.cache import (
+    cache_available,
+    cache_claim,
+    cache_get,
+    cache_list,
+    cache_list_remove,
+    cache_push,
+    cache_set,
+)
+from app.core.tenant import (
+    add_finance_report,
+    get_mission,
+    mission_finance_periods,
+    mission_finance_state,
+)
+
+Job = Dict[str, object]
+
+QUEUE_KEY = "jobs:queue"
+PROCESSING_KEY = "jobs:processing"
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def _now() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def _save(job: Job) -> None:
+    ttl = int(current_app.config.get("JOB_TTL", 86400))
+    job["touched"] = time.time()
+    cache_set(_job_key(str(job["id"])), job, ttl)
+
+
+def build_finance_report(slug: str, created_by: str) -> bool:
+    mission = get_mission(slug, ("projects",))
+    if not mission:
+        return False
+    projects = [
+        project
+        for project in mission.get("projects", [])
+        if isinstance(project, dict) and project.get("id")
+    ]
+    report = {
+        "periods": mission_finance_periods(mission),
+        "state": mission_finance_state(mission, projects),
+        "created_at": _now(),
+        "created_by": created_by,
+    }
+    return add_finance_report(slug, report)
+
+
+def _finance_report_job(job: Job) -> Dict[str, object]:
+    if not build_finance_report(str(job["slug"]), str(job.get("created_by", ""))):
+        raise RuntimeError("Nao foi possivel salvar o relatorio.")
+    return {}
+
+
+JOB_HANDLERS: Dict[str, Callable[[Job], Dict[str, object]]] = {
+    "finance_report": _finance_report_job,
+}
+
+
+def enqueue(
+    job_type: str, slug: str, created_by: str, params: Optional[Dict[str, object]] = None
+) -> Optional[str]:
+    if not current_app.config.get("JOBS_ENABLED") or not cache_available():
+        return None
+    job: Job = {
+        "id": uuid.uuid4().hex,
+        "type": job_type,
+        "slug": slug,
+        "created_by": created_by,
+        "params": params or {},
+        "status": STATUS_QUEUED,
+        "created_at": _now(),
+        "result": None,
+        "error": "",
+    }
+    _save(job)
+    if not cache_push(QUEUE_KEY, str(job["id"])):
+        return None
+    return str(job["id"])
+
+
+def job_status(job_id: str) -> Optional[Job]:
+    return cache_get(_job_key(job_id), local=False)
+
+
+def _heartbeat(app: Flask, job: Job, stop: threading.Event) -> None:
+    interval = max(int(app.config.get("JOB_TIMEOUT", 900)) // 3, 1)
+    while not stop.wait(interval):
+        with app.app_context():
+            _save(job)
+
+
+def run_job(job_id: str) -> Optional[Job]:
+    stored = job_status(job_id)
+    if stored is None:
+        return None
+    job = dict(stored)
+    handler = JOB_HANDLERS.get(str(job.get("type")))
+    job.update(status=STATUS_RUNNING, started_at=_now())
+    _save(job)
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat,
+        args=(current_app._get_current_object(), dict(job), stop),
+        name="job-heartbeat",
+        daemon=True,
+    )
+    heartbeat.start()
+    try:
+        if handler is None:
+            raise ValueError(f"Tipo de tarefa desconhecido: {job.get('type')}")
+        job.update(status=STATUS_DONE, result=handler(job))
+    except Exception as exc:
+        current_app.logger.exception("Falha na tarefa %s (%s).", job_id, job.get("type"))
+        job.update(status=STATUS_FAILED, error=str(exc))
+    finally:
+        stop.set()
+        heartbeat.join()
+    job["finished_at"] = _now()
+    _save(job)
+    cache_list_remove(PROCESSING_KEY, job_id)
+    return job
+
+
+def recover_jobs() -> int:
+    config = current_app.config
+    timeout = int(config.get("JOB_TIMEOUT", 900))
+    max_attempts = int(config.get("JOB_MAX_ATTEMPTS", 3))
+    requeued = 0
+    for job_id in cache_list(PROCESSING_KEY):
+        stored = job_status(job_id)
+        finished = stored is None or stored.get("status") in (STATUS_DONE, STATUS_FAILED)
+        if not finished and time.time() - float(stored.get("touched") or 0) < timeout:
+            continue
+        if not cache_list_remove(PROCESSING_KEY, job_id) or finished:
+            continue
+        job = dict(stored)
+        job["attempts"] = int(job.get("attempts") or 0) + 1
+        if job["attempts"] >= max_attempts:
+            job.update(status=STATUS_FAILED, error="Tarefa abandonada pelo worker.")
+            job["finished_at"] = _now()
+            _save(job)
+            continue
+        job["status"] = STATUS_QUEUED
+        _save(job)
+        cache_push(QUEUE_KEY, job_id)
+        requeued += 1
+    return requeued
+
+
+def run_worker(app: Flask, max_jobs: Optional[int] = None) -> int:
+    processed = 0
+    next_recovery = 0.0
+    while max_jobs is None or processed < max_jobs:
+        with app.app_context():
+            timeout = int(app.config.get("JOB_BLOCK_TIMEOUT", 5))
+            if time.monotonic() >= next_recovery:
+                recover_jobs()
+                next_recovery = time.monotonic() + timeout
+            job_id = cache_claim(QUEUE_KEY, PROCESSING_KEY, timeout)
+            if job_id is None:
+                if max_jobs is not None:
+                    return processed
+                if not cache_available():
+                    time.sleep(timeout)
+                continue
+            run_job(job_id)
+            processed += 1
+    return processed
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Set
+
+from flask import current_app
+
+from app.core.cache import cache_available, cache_lock, cache_ping, cache_unlock
+from app.core.db import get_connection
+from app.core.mysql_store import invalidate_mission
+
+MaintenanceReport = Dict[str, object]
+
+LOCK_KEY = "lock:maintenance"
+RETENTION_DAYS = 365
+
+
+def _batch_size() -> int:
+    return int(current_app.config.get("MAINTENANCE_BATCH", 500))
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join(["%s"] * count)
+
+
+def _backfill_closed_at(connection, cursor, slugs: Set[str]) -> int:
+    today = datetime.utcnow().date()
+    batch = _batch_size()
+    updated = 0
+    while True:
+        cursor.execute(
+            """
+            SELECT p.id, m.slug
+            FROM mission_projects p
+            JOIN missions m ON m.id = p.mission_id
+            WHERE p.status = %s AND (p.closed_at IS NULL OR p.closed_at = '')
+            ORDER BY p.id
+            LIMIT %s
+            """,
+            ("concluida", batch),
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return updated
+        ids = [row["id"] for row in rows]
+        cursor.execute(
+            f"UPDATE mission_projects SET closed_at = %s WHERE id IN ({_placeholders(len(ids))})",
+            (today, *ids),
+        )
+        connection.commit()
+        updated += len(ids)
+        slugs.update(row["slug"] for row in rows)
+        if len(rows) < batch:
+            return updated
+
+
+def _delete_project_rows(connection, cursor, table: str, projects: List[dict]) -> int:
+    batch = _batch_size()
+    pairs = ", ".join(["(%s, %s)"] * len(projects))
+    params = tuple(
+        value for row in projects for value in (row["mission_id"], row["project_key"])
+    )
+    deleted = 0
+    while True:
+        cursor.execute(
+            f"""
+            DELETE FROM {table}
+            WHERE (mission_id, project_key) IN ({pairs})
+            LIMIT %s
+            """,
+            (*params, batch),
+        )
+        connection.commit()
+        deleted += cursor.rowcount
+        if cursor.rowcount < batch:
+            return deleted
+
+
+def _purge_expired_projects(connection, cursor, slugs: Set[str]) -> Dict[str, int]:
+    cutoff = datetime.utcnow().date() - timedelta(days=RETENTION_DAYS)
+    batch = _batch_size()
+    counts = {"projects": 0, "tasks": 0, "finance_entries": 0}
+    while True:
+        cursor.execute(
+            """
+            SELECT p.id, p.mission_id, p.project_key, m.slug
+            FROM mission_projects p
+            JOIN missions m ON m.id = p.mission_id
+            WHERE p.status = %s AND p.closed_at IS NOT NULL AND p.closed_at < %s
+            ORDER BY p.id
+            LIMIT %s
+            """,
+            ("concluida", cutoff, batch),
+        )
+        projects = cursor.fetchall()
+        if not projects:
+            return counts
+        counts["tasks"] += _delete_project_rows(connection, cursor, "project_tasks", projects)
+        counts["finance_entries"] += _delete_project_rows(
+            connection, cursor, "finance_entries", projects
+        )
+        for table in ("finance_ledger_totals", "finance_ledger_daily"):
+            _delete_project_rows(connection, cursor, table, projects)
+        ids = [row["id"] for row in projects]
+        cursor.execute(
+            f"DELETE FROM mission_projects WHERE id IN ({_placeholders(len(ids))})",
+            tuple(ids),
+        )
+        connection.commit()
+        counts["projects"] += len(ids)
+        slugs.update(row["slug"] for row in projects)
+        if len(projects) < batch:
+            return counts
+
+
+def _touch(connection, cursor, slugs: Set[str]) -> None:
+    if not slugs:
+        return
+    cursor.execute(
+        "UPDATE missions SET updated_at = CURRENT_TIMESTAMP "
+        f"WHERE slug IN ({_placeholders(len(slugs))})",
+        tuple(sorted(slugs)),
+    )
+    connection.commit()
+
+
+def _invalidate(slugs: Set[str]) -> None:
+    for slug in sorted(slugs):
+        invalidate_mission(slug)
+
+
+def run_maintenance() -> MaintenanceReport:
+    slugs: Set[str] = set()
+    with get_connection() as connection:
+        if connection is None:
+            return {"skipped": True}
+        with connection.cursor() as cursor:
+            closed_at = _backfill_closed_at(connection, cursor, slugs)
+            purged = _purge_expired_projects(connection, cursor, slugs)
+            _touch(connection, cursor, slugs)
+    _invalidate(slugs)
+    return {"closed_at": closed_at, **purged, "missions": sorted(slugs)}
+
+
+def run_maintenance_locked() -> MaintenanceReport:
+    ttl = int(current_app.config.get("MAINTENANCE_LOCK_TTL", 900))
+    token = cache_lock(LOCK_KEY, ttl) if cache_available() else None
+    if token is None:
+        if cache_ping():
+            return {"skipped": True, "reason": "locked"}
+        current_app.logger.warning("Redis indisponivel; manutencao ignorada.")
+        return {"skipped": True, "reason": "unavailable"}
+    try:
+        return run_maintenance()
+    finally:
+        cache_unlock(LOCK_KEY, token)
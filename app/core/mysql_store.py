@@ -1,15 +1,37 @@
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import pymysql
 from flask import current_app
 
-from app.core.cache import cache_delete, cache_get, cache_set
+from app.core.cache import (
+    cache_counters,
+    cache_delete,
+    cache_get_many,
+    cache_get_or_build,
+    cache_get_or_build_many,
+    cache_incr,
+    cache_set,
+)
 from app.core.db import get_connection
+from app.core.finance import ENTRY_TYPE_IN, ENTRY_TYPE_OUT, period_bounds, to_cents
 
 Mission = Dict[str, object]
 
 
+SECTIONS = (
+    "core",
+    "about",
+    "help",
+    "contact",
+    "projects",
+    "users",
+    "finance",
+)
+
+
 def _fetchone(cursor, query: str, params: tuple):
     cursor.execute(query, params)
     return cursor.fetchone()
@@ -20,205 +42,422 @@ def _fetchall(cursor, query: str, params: tuple):
     return cursor.fetchall()
 
 
-def _cleanup_projects(cursor) -> None:
-    cutoff = datetime.utcnow().date() - timedelta(days=365)
-    cursor.execute(
-        """
-        SELECT mission_id, project_key
-        FROM mission_projects
-        WHERE status = %s AND closed_at IS NOT NULL AND closed_at < %s
-        """,
-        ("concluida", cutoff),
-    )
-    expired = cursor.fetchall()
-    for row in expired:
-        cursor.execute(
-            """
-            DELETE FROM project_tasks
-            WHERE mission_id = %s AND project_key = %s
-            """,
-            (row["mission_id"], row["project_key"]),
-        )
-        cursor.execute(
-            """
-            DELETE FROM finance_entries
-            WHERE mission_id = %s AND project_key = %s
-            """,
-            (row["mission_id"], row["project_key"]),
-        )
-    cursor.execute(
-        """
-        DELETE FROM mission_projects
-        WHERE status = %s AND closed_at IS NOT NULL AND closed_at < %s
-        """,
-        ("concluida", cutoff),
-    )
+def _version_key(slug: str) -> str:
+    return f"mission:{slug}:ver"
 
 
-def _ensure_closed_at(cursor) -> None:
-    today = datetime.utcnow().date()
-    cursor.execute(
-        """
-        UPDATE mission_projects
-        SET closed_at = %s
-        WHERE status = %s AND (closed_at IS NULL OR closed_at = '')
-        """,
-        (today, "concluida"),
+def _mission_key(slug: str, version: int, section: str) -> str:
+    return f"mission:{slug}:v{version}:{section}"
+
+
+def _mission_ttl() -> int:
+    return current_app.config.get("REDIS_TTL_MISSION", 600)
+
+
+def _versioned_many(
+    keys: List[str], builder: Callable[[List[str]], Dict[str, Optional[Mission]]], cacheable: bool
+) -> Dict[str, Optional[Mission]]:
+    if not cacheable:
+        return builder(keys)
+    return cache_get_or_build_many(keys, builder, _mission_ttl())
+
+
+def mission_versions(slugs: List[str]) -> Dict[str, int]:
+    keys = [_version_key(slug) for slug in slugs]
+    values = cache_get_many(keys)
+    unseeded = [key for key, value in zip(keys, values) if value is None]
+    seeded = dict(zip(unseeded, cache_counters(unseeded)))
+    return {
+        slug: int(value or seeded.get(key, 0))
+        for slug, key, value in zip(slugs, keys, values)
+    }
+
+
+def mission_version(slug: str) -> int:
+    return mission_versions([slug])[slug]
+
+
+def mission_counter_key(slug: str) -> str:
+    return _version_key(slug)
+
+
+def mission_core_key(slug: str, version: int) -> str:
+    return _mission_key(slug, version, "core")
+
+
+def mission_keys(slug: str, version: int, sections: Iterable[str] = SECTIONS) -> List[str]:
+    return [_mission_key(slug, version, section) for section in sections]
+
+
+def _missing_key(slug: str) -> str:
+    return f"mission:{slug}:missing"
+
+
+def mission_lookup(slug: str) -> Optional[int]:
+    version, missing = cache_get_many([_version_key(slug), _missing_key(slug)])
+    if missing:
+        return None
+    return int(version or 0)
+
+
+def _mark_missing(slug: str) -> None:
+    cache_set(
+        _missing_key(slug),
+        {"missing": True},
+        current_app.config.get("REDIS_TTL_MISSING", 30),
     )
 
 
-def load_missions() -> Dict[str, Mission]:
-    cached = cache_get("missions:list")
-    if isinstance(cached, dict):
-        return cached
+def invalidate_mission(slug: str) -> int:
+    cache_delete(_missing_key(slug))
+    return cache_incr(_version_key(slug))
+
 
+def _build_mission_index() -> Optional[Dict[str, object]]:
     with get_connection() as connection:
         if connection is None:
-            return {}
+            return None
         with connection.cursor() as cursor:
-            _ensure_closed_at(cursor)
-            _cleanup_projects(cursor)
-            missions = _fetchall(cursor, "SELECT * FROM missions ORDER BY name", ())
-
-    payload = {}
-    for mission in missions:
-        mission_data = _load_mission_by_id(mission["id"])
-        if mission_data:
-            payload[mission_data["slug"]] = mission_data
-    cache_set(
-        "missions:list",
-        payload,
+            rows = _fetchall(cursor, "SELECT slug FROM missions ORDER BY name", ())
+    return {"slugs": [row["slug"] for row in rows]}
+
+
+def _core_builder(keys: Dict[str, str]):
+    def build(pending: List[str]) -> Dict[str, Optional[Mission]]:
+        slugs = [keys[key] for key in pending]
+        with get_connection() as connection:
+            if connection is None:
+                return {}
+            with connection.cursor() as cursor:
+                rows = _fetchall_in(
+                    cursor, "SELECT * FROM missions WHERE slug IN ({ids})", slugs
+                )
+        cores = {row["slug"]: _core_payload(row) for row in rows}
+        return {key: cores.get(keys[key]) for key in pending}
+
+    return build
+
+
+def load_missions() -> Dict[str, Mission]:
+    index = cache_get_or_build(
+        "missions:index",
+        _build_mission_index,
         current_app.config.get("REDIS_TTL_LIST", 120),
     )
-    return payload
+    if not isinstance(index, dict):
+        return {}
+    slugs = list(index.get("slugs", []))
+    versions = mission_versions(slugs)
+    keys = {_mission_key(slug, versions[slug], "core"): slug for slug in slugs}
+    cores = _versioned_many(list(keys), _core_builder(keys), all(versions.values()))
+    return {slug: cores[key] for key, slug in keys.items() if isinstance(cores.get(key), dict)}
+
+
+def _section_builder(mission_id: int, keys: Dict[str, str]):
+    def build(pending: List[str]) -> Dict[str, Optional[Mission]]:
+        sections = [keys[key] for key in pending]
+        with get_connection() as connection:
+            if connection is None:
+                return {}
+            with connection.cursor() as cursor:
+                loaded = _load_sections(cursor, [mission_id], sections).get(mission_id, {})
+        return {key: loaded.get(keys[key]) for key in pending}
 
+    return build
 
-def get_mission(slug: str) -> Optional[Mission]:
-    cached = cache_get(f"mission:{slug}")
-    if isinstance(cached, dict):
-        return cached
 
+def get_mission(
+    slug: str, sections: Iterable[str] = SECTIONS, version: Optional[int] = None
+) -> Optional[Mission]:
+    if version is None:
+        version = mission_lookup(slug)
+        if version is None:
+            return None
+    core_key = _mission_key(slug, version, "core")
+    queried: List[bool] = []
+
+    def build_core(pending: List[str]) -> Dict[str, Optional[Mission]]:
+        built = _core_builder({core_key: slug})(pending)
+        queried.append(bool(built))
+        return built
+
+    cores = _versioned_many([core_key], build_core, bool(version))
+    core = cores.get(core_key)
+    if not isinstance(core, dict):
+        if any(queried):
+            _mark_missing(slug)
+        return None
+    if not version:
+        version = cache_counters([_version_key(slug)])[0]
+
+    requested = set(sections)
+    keys = {
+        _mission_key(slug, version, section): section
+        for section in SECTIONS
+        if section in requested and section != "core"
+    }
+    loaded = _versioned_many(list(keys), _section_builder(core["id"], keys), bool(version))
+
+    payload = dict(core)
+    for key in keys:
+        payload.update(loaded.get(key) or {})
+    return payload
+
+
+def mission_stamps(slugs: List[str]) -> Dict[str, str]:
+    if not slugs:
+        return {}
     with get_connection() as connection:
         if connection is None:
-            return None
+            return {}
         with connection.cursor() as cursor:
-            _ensure_closed_at(cursor)
-            _cleanup_projects(cursor)
-            mission = _fetchone(
-                cursor,
-                "SELECT * FROM missions WHERE slug = %s",
-                (slug,),
+            rows = _fetchall_in(
+                cursor, "SELECT slug, updated_at FROM missions WHERE slug IN ({ids})", slugs
             )
-            if not mission:
-                return None
-    payload = _load_mission_by_id(mission["id"])
-    if payload:
-        cache_set(
-            f"mission:{slug}",
-            payload,
-            current_app.config.get("REDIS_TTL_MISSION", 600),
-        )
-    return payload
+    return {row["slug"]: str(row.get("updated_at") or "") for row in rows}
 
 
 def list_missions() -> List[Mission]:
     return sorted(load_missions().values(), key=lambda item: item.get("name", ""))
 
 
-def _load_mission_by_id(mission_id: int) -> Optional[Mission]:
-    with get_connection() as connection:
-        if connection is None:
-            return None
-        with connection.cursor() as cursor:
-            mission = _fetchone(
-                cursor,
-                "SELECT * FROM missions WHERE id = %s",
-                (mission_id,),
-            )
-            if not mission:
-                return None
+def _chunked(values: List[object], size: int) -> Iterator[List[object]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
 
-            about = _fetchone(
-                cursor,
-                "SELECT * FROM mission_about WHERE mission_id = %s",
-                (mission_id,),
-            )
-            values = _fetchall(
-                cursor,
-                "SELECT value FROM mission_values WHERE mission_id = %s",
-                (mission_id,),
-            )
-            help_items = _fetchall(
-                cursor,
-                "SELECT title, description FROM mission_help WHERE mission_id = %s",
-                (mission_id,),
-            )
-            contact = _fetchone(
-                cursor,
-                "SELECT * FROM mission_contact WHERE mission_id = %s",
-                (mission_id,),
-            )
-            social = _fetchone(
-                cursor,
-                "SELECT * FROM mission_contact_social WHERE mission_id = %s",
-                (mission_id,),
-            )
-            projects = _fetchall(
-                cursor,
-                """
-                SELECT project_key, title, description, status, meeting_link, budget, closed_at
-                FROM mission_projects
-                WHERE mission_id = %s
-                """,
-                (mission_id,),
-            )
-            tasks = _fetchall(
-                cursor,
-                """
-                SELECT project_key, title, status, assignee, weight
-                FROM project_tasks
-                WHERE mission_id = %s
-                """,
-                (mission_id,),
-            )
-            users = _fetchall(
-                cursor,
-                """
-                SELECT name, email, institutional_email, role, status
-                FROM mission_users
-                WHERE mission_id = %s
-                """,
-                (mission_id,),
-            )
-            chat_messages = _fetchall(
-                cursor,
-                """
-                SELECT from_email, from_name, to_email, message, sent_at
-                FROM chat_messages
-                WHERE mission_id = %s
-                """,
-                (mission_id,),
-            )
-            finance_entries = _fetchall(
-                cursor,
-                """
-                SELECT date, type, amount, description, category, receipt_link,
-                       project_key, created_by, created_at
-                FROM finance_entries
-                WHERE mission_id = %s
-                """,
-                (mission_id,),
-            )
-            finance_reports = _fetchall(
-                cursor,
-                """
-                SELECT report_json, created_by, created_at
-                FROM finance_reports
-                WHERE mission_id = %s
-                """,
-                (mission_id,),
+
+def _fetchall_in(cursor, query: str, values: List[object]) -> List[dict]:
+    chunk_size = int(current_app.config.get("MYSQL_IN_CHUNK", 500))
+    rows: List[dict] = []
+    for chunk in _chunked(values, chunk_size):
+        placeholders = ", ".join(["%s"] * len(chunk))
+        rows.extend(_fetchall(cursor, query.format(ids=placeholders), tuple(chunk)))
+    return rows
+
+
+def _group_by_mission(rows: Iterable[dict]) -> Dict[int, List[dict]]:
+    grouped: Dict[int, List[dict]] = defaultdict(list)
+    for row in rows:
+        grouped[row.get("mission_id")].append(row)
+    return grouped
+
+
+def _first_by_mission(rows: Iterable[dict]) -> Dict[int, dict]:
+    return {row.get("mission_id"): row for row in rows}
+
+
+def _load_sections(
+    cursor, mission_ids: List[int], sections: Iterable[str]
+) -> Dict[int, Dict[str, Mission]]:
+    payloads: Dict[int, Dict[str, Mission]] = {mission_id: {} for mission_id in mission_ids}
+    if not mission_ids:
+        return payloads
+    for section in sections:
+        loader = _SECTION_LOADERS[section]
+        for mission_id, value in loader(cursor, mission_ids).items():
+            payloads[mission_id][section] = value
+    return payloads
+
+
+def _load_core(cursor, mission_ids: List[int]) -> Dict[int, Mission]:
+    rows = _fetchall_in(cursor, "SELECT * FROM missions WHERE id IN ({ids})", mission_ids)
+    return {row["id"]: _core_payload(row) for row in rows}
+
+
+def _load_about(cursor, mission_ids: List[int]) -> Dict[int, Mission]:
+    about = _first_by_mission(
+        _fetchall_in(
+            cursor,
+            "SELECT * FROM mission_about WHERE mission_id IN ({ids})",
+            mission_ids,
+        )
+    )
+    values = _group_by_mission(
+        _fetchall_in(
+            cursor,
+            "SELECT mission_id, value FROM mission_values WHERE mission_id IN ({ids})",
+            mission_ids,
+        )
+    )
+    return {
+        mission_id: {"about": _about_payload(about.get(mission_id), values.get(mission_id, []))}
+        for mission_id in mission_ids
+    }
+
+
+def _load_help(cursor, mission_ids: List[int]) -> Dict[int, Mission]:
+    help_items = _group_by_mission(
+        _fetchall_in(
+            cursor,
+            """
+            SELECT mission_id, title, description
+            FROM mission_help
+            WHERE mission_id IN ({ids})
+            """,
+            mission_ids,
+        )
+    )
+    return {
+        mission_id: {
+            "help": [
+                {"title": item.get("title", ""), "description": item.get("description", "")}
+                for item in help_items.get(mission_id, [])
+            ]
+        }
+        for mission_id in mission_ids
+    }
+
+
+def _load_contact(cursor, mission_ids: List[int]) -> Dict[int, Mission]:
+    contact = _first_by_mission(
+        _fetchall_in(
+            cursor,
+            "SELECT * FROM mission_contact WHERE mission_id IN ({ids})",
+            mission_ids,
+        )
+    )
+    social = _first_by_mission(
+        _fetchall_in(
+            cursor,
+            "SELECT * FROM mission_contact_social WHERE mission_id IN ({ids})",
+            mission_ids,
+        )
+    )
+    return {
+        mission_id: {
+            "contact": _contact_payload(contact.get(mission_id), social.get(mission_id))
+        }
+        for mission_id in mission_ids
+    }
+
+
+def _load_projects(cursor, mission_ids: List[int]) -> Dict[int, Mission]:
+    projects = _group_by_mission(
+        _fetchall_in(
+            cursor,
+            """
+            SELECT mission_id, project_key, title, description, status, meeting_link,
+                   budget, closed_at
+            FROM mission_projects
+            WHERE mission_id IN ({ids})
+            """,
+            mission_ids,
+        )
+    )
+    tasks = _group_by_mission(
+        _fetchall_in(
+            cursor,
+            """
+            SELECT mission_id, project_key, title, status, assignee, weight
+            FROM project_tasks
+            WHERE mission_id IN ({ids})
+            """,
+            mission_ids,
+        )
+    )
+    return {
+        mission_id: {
+            "projects": _projects_payload(
+                projects.get(mission_id, []), tasks.get(mission_id, [])
             )
+        }
+        for mission_id in mission_ids
+    }
+
 
+def _load_users(cursor, mission_ids: List[int]) -> Dict[int, Mission]:
+    users = _group_by_mission(
+        _fetchall_in(
+            cursor,
+            """
+            SELECT mission_id, name, email, institutional_email, role, status
+            FROM mission_users
+            WHERE mission_id IN ({ids})
+            """,
+            mission_ids,
+        )
+    )
+    return {
+        mission_id: {"users": [_without_mission_id(user) for user in users.get(mission_id, [])]}
+        for mission_id in mission_ids
+    }
+
+
+def _load_finance(cursor, mission_ids: List[int]) -> Dict[int, Mission]:
+    finance_entries = _group_by_mission(
+        _fetchall_in(
+            cursor,
+            """
+            SELECT mission_id, date, type, amount, description, category, receipt_link,
+                   project_key, created_by, created_at
+            FROM finance_entries
+            WHERE mission_id IN ({ids})
+            """,
+            mission_ids,
+        )
+    )
+    return {
+        mission_id: {
+            "finance_entries": _finance_entries_payload(finance_entries.get(mission_id, []))
+        }
+        for mission_id in mission_ids
+    }
+
+
+_SECTION_LOADERS: Dict[str, Callable[..., Dict[int, Mission]]] = {
+    "core": _load_core,
+    "about": _load_about,
+    "help": _load_help,
+    "contact": _load_contact,
+    "projects": _load_projects,
+    "users": _load_users,
+    "finance": _load_finance,
+}
+
+
+def _core_payload(mission: dict) -> Mission:
+    return {
+        "id": mission.get("id"),
+        "slug": mission.get("slug", ""),
+        "name": mission.get("name", ""),
+        "location": mission.get("location", ""),
+        "description": mission.get("description", ""),
+        "verse_text": mission.get("verse_text", ""),
+        "verse_ref": mission.get("verse_ref", ""),
+        "meeting_link": mission.get("meeting_link", ""),
+        "updated_at": str(mission.get("updated_at") or ""),
+    }
+
+
+def _about_payload(about: Optional[dict], values: List[dict]) -> Dict[str, object]:
+    if not about:
+        return {}
+    return {
+        "summary": about.get("summary", ""),
+        "mission": about.get("mission", ""),
+        "vision": about.get("vision", ""),
+        "values": [item.get("value", "") for item in values],
+        "team": about.get("team", ""),
+    }
+
+
+def _contact_payload(contact: Optional[dict], social: Optional[dict]) -> Dict[str, object]:
+    if not contact:
+        return {}
+    return {
+        "email": contact.get("email", ""),
+        "phone": contact.get("phone", ""),
+        "address": contact.get("address", ""),
+        "hours": contact.get("hours", ""),
+        "social": {
+            "instagram": (social or {}).get("instagram", ""),
+            "facebook": (social or {}).get("facebook", ""),
+            "site": (social or {}).get("site", ""),
+        },
+    }
+
+
+def _projects_payload(projects: List[dict], tasks: List[dict]) -> List[Dict[str, object]]:
     tasks_by_project = {}
     for task in tasks:
         project_key = task.get("project_key")
@@ -246,172 +485,534 @@ def _load_mission_by_id(mission_id: int) -> Optional[Mission]:
                 "tasks": tasks_by_project.get(project_key, []),
             }
         )
+    return projects_payload
 
-    finance_entries_payload = []
-    for entry in finance_entries:
-        date_value = entry.get("date")
-        if isinstance(date_value, datetime):
-            date_value = date_value.strftime("%Y-%m-%d")
-        finance_entries_payload.append(
-            {
-                "date": str(date_value or ""),
-                "type": entry.get("type", ""),
-                "amount": float(entry.get("amount") or 0),
-                "description": entry.get("description", ""),
-                "category": entry.get("category", ""),
-                "receipt_link": entry.get("receipt_link", ""),
-                "project_id": entry.get("project_key", ""),
-                "created_by": entry.get("created_by", ""),
-                "created_at": entry.get("created_at", ""),
-            }
-        )
-
-    reports_payload = []
-    for report in finance_reports:
-        raw = report.get("report_json", "")
-        try:
-            report_json = json.loads(raw) if raw else {}
-        except json.JSONDecodeError:
-            report_json = {}
-        report_json["created_by"] = report.get("created_by", "")
-        report_json["created_at"] = report.get("created_at", "")
-        reports_payload.append(report_json)
-
-    about_payload = {}
-    if about:
-        about_payload = {
-            "summary": about.get("summary", ""),
-            "mission": about.get("mission", ""),
-            "vision": about.get("vision", ""),
-            "values": [item.get("value", "") for item in values],
-            "team": about.get("team", ""),
-        }
-
-    contact_payload = {}
-    if contact:
-        contact_payload = {
-            "email": contact.get("email", ""),
-            "phone": contact.get("phone", ""),
-            "address": contact.get("address", ""),
-            "hours": contact.get("hours", ""),
-            "social": {
-                "instagram": (social or {}).get("instagram", ""),
-                "facebook": (social or {}).get("facebook", ""),
-                "site": (social or {}).get("site", ""),
-            },
-        }
 
+def _finance_entry_payload(entry: dict) -> Dict[str, object]:
+    date_value = entry.get("date")
+    if isinstance(date_value, datetime):
+        date_value = date_value.strftime("%Y-%m-%d")
     return {
-        "slug": mission.get("slug", ""),
-        "name": mission.get("name", ""),
-        "location": mission.get("location", ""),
-        "description": mission.get("description", ""),
-        "verse_text": mission.get("verse_text", ""),
-        "verse_ref": mission.get("verse_ref", ""),
-        "meeting_link": mission.get("meeting_link", ""),
-        "about": about_payload,
-        "projects": projects_payload,
-        "help": [
-            {"title": item.get("title", ""), "description": item.get("description", "")}
-            for item in help_items
-        ],
-        "contact": contact_payload,
-        "users": users,
-        "chat_messages": chat_messages,
-        "finance_entries": finance_entries_payload,
-        "finance_reports": reports_payload,
+        "date": str(date_value or ""),
+        "type": entry.get("type", ""),
+        "amount": float(entry.get("amount") or 0),
+        "description": entry.get("description", ""),
+        "category": entry.get("category", ""),
+        "receipt_link": entry.get("receipt_link", ""),
+        "project_id": entry.get("project_key", ""),
+        "created_by": entry.get("created_by", ""),
+        "created_at": entry.get("created_at", ""),
     }
 
 
-def update_mission_meeting_link(slug: str, meeting_link: str) -> bool:
+def _finance_entries_payload(finance_entries: List[dict]) -> List[Dict[str, object]]:
+    return [_finance_entry_payload(entry) for entry in finance_entries]
+
+
+def _report_payload(report: dict) -> Dict[str, object]:
+    raw = report.get("report_json", "")
+    try:
+        report_json = json.loads(raw) if raw else {}
+    except json.JSONDecodeError:
+        report_json = {}
+    report_json["id"] = report.get("id")
+    report_json["created_by"] = report.get("created_by", "")
+    report_json["created_at"] = report.get("created_at", "")
+    return report_json
+
+
+def _without_mission_id(row: dict) -> dict:
+    return {key: value for key, value in row.items() if key != "mission_id"}
+
+
+ChatCursor = Tuple[str, int]
+
+
+def list_conversation(
+    mission_id: int,
+    email: str,
+    other_email: str,
+    limit: int,
+    before: Optional[ChatCursor] = None,
+) -> Optional[Tuple[List[Dict[str, object]], bool]]:
+    keyset = ""
+    keyset_params: tuple = ()
+    if before is not None:
+        keyset = " AND (sent_at < %s OR (sent_at = %s AND id < %s))"
+        keyset_params = (before[0], before[0], before[1])
+    direction = f"""
+        (SELECT id, from_email, from_name, to_email, message, sent_at
+        FROM chat_messages
+        WHERE mission_id = %s AND from_email = %s AND to_email = %s{keyset}
+        ORDER BY sent_at DESC, id DESC
+        LIMIT %s)
+    """
+    pairs = [(email, other_email)]
+    if other_email.lower() != email.lower():
+        pairs.append((other_email, email))
+    params: tuple = ()
+    for sender, recipient in pairs:
+        params += (mission_id, sender, recipient, *keyset_params, limit + 1)
     with get_connection() as connection:
         if connection is None:
-            return False
+            return None
         with connection.cursor() as cursor:
-            cursor.execute(
-                "UPDATE missions SET meeting_link = %s WHERE slug = %s",
-                (meeting_link, slug),
+            rows = _fetchall(
+                cursor,
+                f"""
+                SELECT * FROM (
+                  {" UNION ALL ".join([direction] * len(pairs))}
+                ) AS conversation
+                ORDER BY sent_at DESC, id DESC
+                LIMIT %s
+                """,
+                (*params, limit + 1),
             )
-            if cursor.rowcount > 0:
-                cache_delete(f"mission:{slug}", "missions:list")
-                return True
-            return False
+    has_more = len(rows) > limit
+    return list(reversed(rows[:limit])), has_more
 
 
-def update_project_meeting_link(slug: str, project_id: str, meeting_link: str) -> bool:
+ReportCursor = Tuple[str, int]
+
+
+def list_finance_reports(
+    mission_id: int, limit: int, before: Optional[ReportCursor] = None
+) -> Optional[Tuple[List[Dict[str, object]], bool]]:
+    keyset = ""
+    keyset_params: tuple = ()
+    if before is not None:
+        keyset = " AND (created_at < %s OR (created_at = %s AND id < %s))"
+        keyset_params = (before[0], before[0], before[1])
     with get_connection() as connection:
         if connection is None:
-            return False
+            return None
         with connection.cursor() as cursor:
-            cursor.execute(
+            rows = _fetchall(
+                cursor,
+                f"""
+                SELECT id, created_by, created_at
+                FROM finance_reports
+                WHERE mission_id = %s{keyset}
+                ORDER BY created_at DESC, id DESC
+                LIMIT %s
+                """,
+                (mission_id, *keyset_params, limit + 1),
+            )
+    return rows[:limit], len(rows) > limit
+
+
+def get_finance_report(mission_id: int, report_id: int) -> Optional[Dict[str, object]]:
+    with get_connection() as connection:
+        if connection is None:
+            return None
+        with connection.cursor() as cursor:
+            row = _fetchone(
+                cursor,
                 """
-                UPDATE mission_projects
-                SET meeting_link = %s
-                WHERE project_key = %s AND mission_id = (
-                  SELECT id FROM missions WHERE slug = %s
-                )
+                SELECT id, report_json, created_by, created_at
+                FROM finance_reports
+                WHERE mission_id = %s AND id = %s
                 """,
-                (meeting_link, project_id, slug),
+                (mission_id, report_id),
             )
-            if cursor.rowcount > 0:
-                cache_delete(f"mission:{slug}", "missions:list")
-                return True
-            return False
+    return _report_payload(row) if row else None
 
 
-def add_finance_entry(slug: str, entry: Dict[str, object]) -> bool:
+def _project_filter(project_ids: Optional[List[str]]) -> Tuple[str, tuple]:
+    if project_ids is None:
+        return "", ()
+    placeholders = ", ".join(["%s"] * len(project_ids))
+    return f" AND project_key IN ({placeholders})", tuple(project_ids)
+
+
+EntryCursor = Tuple[str, int]
+
+
+def list_finance_entries(
+    mission_id: int,
+    limit: int,
+    before: Optional[EntryCursor] = None,
+    project_ids: Optional[List[str]] = None,
+) -> Optional[Tuple[List[Dict[str, object]], bool]]:
+    if project_ids is not None and not project_ids:
+        return [], False
+    project_clause, project_params = _project_filter(project_ids)
+    keyset = ""
+    keyset_params: tuple = ()
+    if before is not None:
+        keyset = " AND (date < %s OR (date = %s AND id < %s))"
+        keyset_params = (before[0], before[0], before[1])
     with get_connection() as connection:
         if connection is None:
-            return False
+            return None
         with connection.cursor() as cursor:
+            rows = _fetchall(
+                cursor,
+                f"""
+                SELECT id, date, type, amount, description, category, receipt_link,
+                       project_key, created_by, created_at
+                FROM finance_entries
+                WHERE mission_id = %s{keyset}{project_clause}
+                ORDER BY date DESC, id DESC
+                LIMIT %s
+                """,
+                (mission_id, *keyset_params, *project_params, limit + 1),
+            )
+    entries = [{**_finance_entry_payload(row), "id": row["id"]} for row in rows[:limit]]
+    return entries, len(rows) > limit
+
+
+def iter_finance_entries(
+    mission_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    project_ids: Optional[List[str]] = None,
+) -> Iterator[Dict[str, object]]:
+    if project_ids is not None and not project_ids:
+        return
+    project_clause, project_params = _project_filter(project_ids)
+    range_clause = ""
+    range_params: tuple = ()
+    if start is not None:
+        range_clause += " AND date >= %s"
+        range_params += (start,)
+    if end is not None:
+        range_clause += " AND date <= %s"
+        range_params += (end,)
+    batch = int(current_app.config.get("FINANCE_EXPORT_BATCH", 1000))
+    with get_connection() as connection:
+        if connection is None:
+            return
+        cursor = connection.cursor(pymysql.cursors.SSDictCursor)
+        try:
             cursor.execute(
-                """
-                INSERT INTO finance_entries
-                (mission_id, date, type, amount, description, category, receipt_link,
-                 project_key, created_by, created_at)
-                VALUES (
-                  (SELECT id FROM missions WHERE slug = %s),
-                  %s, %s, %s, %s, %s, %s, %s, %s, %s
-                )
+                f"""
+                SELECT date, type, amount, description, category, receipt_link,
+                       project_key, created_by, created_at
+                FROM finance_entries
+                WHERE mission_id = %s{range_clause}{project_clause}
+                ORDER BY date, id
+                """,
+                (mission_id, *range_params, *project_params),
+            )
+            while True:
+                rows = cursor.fetchmany(batch)
+                if not rows:
+                    return
+                for row in rows:
+                    yield _finance_entry_payload(row)
+        finally:
+            cursor.close()
+
+
+def finance_totals(
+    mission_id: int, project_ids: Optional[List[str]] = None
+) -> Optional[Dict[str, object]]:
+    totals = {"central": {"cents_in": 0, "cents_out": 0}, "project_spent": {}}
+    if project_ids is not None and not project_ids:
+        return totals
+    project_clause, project_params = _project_filter(project_ids)
+    with get_connection() as connection:
+        if connection is None:
+            return None
+        with connection.cursor() as cursor:
+            rows = _fetchall(
+                cursor,
+                f"""
+                SELECT project_key, type, total
+                FROM finance_ledger_totals
+                WHERE mission_id = %s{project_clause}
+                """,
+                (mission_id, *project_params),
+            )
+
+    central = totals["central"]
+    project_spent = totals["project_spent"]
+    for row in rows:
+        cents = to_cents(row.get("total") or 0) or 0
+        entry_type = row.get("type")
+        project_key = row.get("project_key")
+        if not project_key:
+            if entry_type == ENTRY_TYPE_IN:
+                central["cents_in"] += cents
+            elif entry_type == ENTRY_TYPE_OUT:
+                central["cents_out"] += cents
+        elif entry_type == ENTRY_TYPE_OUT:
+            project_spent[project_key] = project_spent.get(project_key, 0) + cents
+    return totals
+
+
+def finance_period_totals(
+    mission_id: int, now: datetime, project_ids: Optional[List[str]] = None
+) -> Optional[Dict[str, Dict[str, int]]]:
+    if project_ids is not None and not project_ids:
+        return {}
+    bounds = period_bounds(now)
+    range_start = min(start for start, _ in bounds.values())
+    range_end = max(end for _, end in bounds.values())
+    project_clause, project_params = _project_filter(project_ids)
+    with get_connection() as connection:
+        if connection is None:
+            return None
+        with connection.cursor() as cursor:
+            rows = _fetchall(
+                cursor,
+                f"""
+                SELECT period,
+                       SUM(CASE WHEN type = %s THEN total ELSE 0 END) AS total_in,
+                       SUM(CASE WHEN type = %s THEN 0 ELSE total END) AS total_out
+                FROM (
+                  SELECT type, total,
+                         CASE
+                           WHEN day >= %s AND day < %s THEN 'daily'
+                           WHEN day >= %s AND day < %s THEN 'weekly'
+                           WHEN day >= %s AND day < %s THEN 'monthly'
+                           WHEN day >= %s AND day < %s THEN 'yearly'
+                         END AS period
+                  FROM finance_ledger_daily
+                  WHERE mission_id = %s AND day >= %s AND day < %s{project_clause}
+                ) AS bucketed
+                WHERE period IS NOT NULL
+                GROUP BY period
                 """,
                 (
-                    slug,
-                    entry.get("date"),
-                    entry.get("type"),
-                    entry.get("amount"),
-                    entry.get("description"),
-                    entry.get("category"),
-                    entry.get("receipt_link"),
-                    entry.get("project_id"),
-                    entry.get("created_by"),
-                    entry.get("created_at"),
+                    ENTRY_TYPE_IN,
+                    ENTRY_TYPE_IN,
+                    *bounds["daily"],
+                    *bounds["weekly"],
+                    *bounds["monthly"],
+                    *bounds["yearly"],
+                    mission_id,
+                    range_start,
+                    range_end,
+                    *project_params,
                 ),
             )
-            if cursor.rowcount > 0:
-                cache_delete(f"mission:{slug}", "missions:list")
-                return True
-            return False
+    return {
+        row["period"]: {
+            "cents_in": to_cents(row.get("total_in") or 0) or 0,
+            "cents_out": to_cents(row.get("total_out") or 0) or 0,
+        }
+        for row in rows
+    }
 
 
-def update_project_budget(slug: str, project_id: str, budget: float) -> bool:
+def finance_daily_totals(
+    mission_id: int, start: date, end: date, project_ids: Optional[List[str]] = None
+) -> Optional[List[Dict[str, object]]]:
+    if project_ids is not None and not project_ids:
+        return []
+    project_clause, project_params = _project_filter(project_ids)
     with get_connection() as connection:
         if connection is None:
-            return False
+            return None
         with connection.cursor() as cursor:
-            cursor.execute(
-                """
-                UPDATE mission_projects
-                SET budget = %s
-                WHERE project_key = %s AND mission_id = (
-                  SELECT id FROM missions WHERE slug = %s
-                )
+            return _fetchall(
+                cursor,
+                f"""
+                SELECT day AS date, type, SUM(total) AS amount
+                FROM finance_ledger_daily
+                WHERE mission_id = %s AND day >= %s AND day < %s{project_clause}
+                GROUP BY day, type
                 """,
-                (budget, project_id, slug),
+                (mission_id, start, end, *project_params),
             )
-            if cursor.rowcount > 0:
-                cache_delete(f"mission:{slug}", "missions:list")
-                return True
+
+
+def _touch_mission(cursor, slug: str) -> None:
+    cursor.execute("UPDATE missions SET updated_at = CURRENT_TIMESTAMP WHERE slug = %s", (slug,))
+
+
+_LEDGER_TOTALS_UPSERT = """
+INSERT INTO finance_ledger_totals (mission_id, project_key, type, total)
+VALUES (%s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE total = total + VALUES(total)
+"""
+
+_LEDGER_DAILY_UPSERT = """
+INSERT INTO finance_ledger_daily (mission_id, day, project_key, type, total)
+VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE total = total + VALUES(total)
+"""
+
+
+def _apply_to_ledger(cursor, mission_id: int, entry: Dict[str, object]) -> None:
+    amount = entry.get("amount")
+    if amount is None:
+        return
+    project_key = entry.get("project_id") or ""
+    entry_type = entry.get("type") or ""
+    cursor.execute(_LEDGER_TOTALS_UPSERT, (mission_id, project_key, entry_type, amount))
+    if entry.get("date"):
+        cursor.execute(
+            _LEDGER_DAILY_UPSERT, (mission_id, entry.get("date"), project_key, entry_type, amount)
+        )
+
+
+def rebuild_mission_ledger(cursor, mission_id: int) -> None:
+    cursor.execute("DELETE FROM finance_ledger_totals WHERE mission_id = %s", (mission_id,))
+    cursor.execute("DELETE FROM finance_ledger_daily WHERE mission_id = %s", (mission_id,))
+    cursor.execute(
+        """
+        INSERT INTO finance_ledger_totals (mission_id, project_key, type, total)
+        SELECT mission_id, COALESCE(project_key, ''), COALESCE(type, ''), SUM(amount)
+        FROM finance_entries
+        WHERE mission_id = %s AND amount IS NOT NULL
+        GROUP BY mission_id, COALESCE(project_key, ''), COALESCE(type, '')
+        """,
+        (mission_id,),
+    )
+    cursor.execute(
+        """
+        INSERT INTO finance_ledger_daily (mission_id, day, project_key, type, total)
+        SELECT mission_id, date, COALESCE(project_key, ''), COALESCE(type, ''), SUM(amount)
+        FROM finance_entries
+        WHERE mission_id = %s AND amount IS NOT NULL AND date IS NOT NULL
+        GROUP BY mission_id, date, COALESCE(project_key, ''), COALESCE(type, '')
+        """,
+        (mission_id,),
+    )
+
+
+def _ledger_snapshot(cursor, mission_id: int) -> List[tuple]:
+    rows = _fetchall(
+        cursor,
+        """
+        SELECT project_key, type, total
+        FROM finance_ledger_totals
+        WHERE mission_id = %s
+        ORDER BY project_key, type
+        """,
+        (mission_id,),
+    )
+    return [(row["project_key"], row["type"], float(row["total"] or 0)) for row in rows]
+
+
+def rebuild_finance_ledger(slugs: Optional[List[str]] = None) -> Dict[str, object]:
+    with get_connection() as connection:
+        if connection is None:
+            return {"skipped": True}
+        with connection.cursor() as cursor:
+            if slugs is None:
+                rows = _fetchall(cursor, "SELECT id, slug FROM missions ORDER BY id", ())
+            else:
+                rows = [
+                    row
+                    for slug in slugs
+                    for row in _fetchall(
+                        cursor, "SELECT id, slug FROM missions WHERE slug = %s", (slug,)
+                    )
+                ]
+            drifted = []
+            for row in rows:
+                before = _ledger_snapshot(cursor, row["id"])
+                try:
+                    rebuild_mission_ledger(cursor, row["id"])
+                    after = _ledger_snapshot(cursor, row["id"])
+                    if before != after:
+                        _touch_mission(cursor, row["slug"])
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+                if before != after:
+                    drifted.append(row["slug"])
+                    invalidate_mission(row["slug"])
+    return {"missions": len(rows), "drifted": drifted}
+
+
+def _update_mission_rows(slug: str, query: str, params: tuple) -> bool:
+    with get_connection() as connection:
+        if connection is None:
             return False
+        with connection.cursor() as cursor:
+            try:
+                cursor.execute(query, params)
+                if cursor.rowcount <= 0:
+                    connection.rollback()
+                    return False
+                _touch_mission(cursor, slug)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+    invalidate_mission(slug)
+    return True
+
+
+def update_mission_meeting_link(slug: str, meeting_link: str) -> bool:
+    return _update_mission_rows(
+        slug,
+        "UPDATE missions SET meeting_link = %s WHERE slug = %s",
+        (meeting_link, slug),
+    )
+
+
+def update_project_meeting_link(slug: str, project_id: str, meeting_link: str) -> bool:
+    return _update_mission_rows(
+        slug,
+        """
+        UPDATE mission_projects
+        SET meeting_link = %s
+        WHERE project_key = %s AND mission_id = (
+          SELECT id FROM missions WHERE slug = %s
+        )
+        """,
+        (meeting_link, project_id, slug),
+    )
+
+
+def add_finance_entry(slug: str, entry: Dict[str, object]) -> bool:
+    with get_connection() as connection:
+        if connection is None:
+            return False
+        with connection.cursor() as cursor:
+            mission = _fetchone(cursor, "SELECT id FROM missions WHERE slug = %s", (slug,))
+            if not mission:
+                return False
+            try:
+                cursor.execute(
+                    """
+                    INSERT INTO finance_entries
+                    (mission_id, date, type, amount, description, category, receipt_link,
+                     project_key, created_by, created_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    (
+                        mission["id"],
+                        entry.get("date"),
+                        entry.get("type"),
+                        entry.get("amount"),
+                        entry.get("description"),
+                        entry.get("category"),
+                        entry.get("receipt_link"),
+                        entry.get("project_id"),
+                        entry.get("created_by"),
+                        entry.get("created_at"),
+                    ),
+                )
+                _apply_to_ledger(cursor, mission["id"], entry)
+                _touch_mission(cursor, slug)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+    invalidate_mission(slug)
+    return True
+
+
+def update_project_budget(slug: str, project_id: str, budget: float) -> bool:
+    return _update_mission_rows(
+        slug,
+        """
+        UPDATE mission_projects
+        SET budget = %s
+        WHERE project_key = %s AND mission_id = (
+          SELECT id FROM missions WHERE slug = %s
+        )
+        """,
+        (budget, project_id, slug),
+    )
 
 
 def add_finance_report(slug: str, report: Dict[str, object]) -> bool:
@@ -441,6 +1042,6 @@ def add_finance_report(slug: str, report: Dict[str, object]) -> bool:
                 ),
             )
             if cursor.rowcount > 0:
-                cache_delete(f"mission:{slug}", "missions:list")
+                connection.commit()
                 return True
             return False
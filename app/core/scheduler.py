@@ -0,0 +1,30 @@
+import threading
+from typing import Callable
+
+from flask import Flask
+
+from app.core.cache import cache_lock
+
+
+def _claim_slot(name: str, interval: int) -> bool:
+    return cache_lock(f"schedule:{name}", interval) is not None
+
+
+def start_periodic_task(
+    app: Flask, name: str, interval: int, task: Callable[[], object]
+) -> threading.Thread:
+    stop = threading.Event()
+
+    def _loop() -> None:
+        while not stop.is_set():
+            with app.app_context():
+                try:
+                    if _claim_slot(name, interval):
+                        task()
+                except Exception:
+                    app.logger.exception("Falha na tarefa periodica '%s'.", name)
+            stop.wait(interval)
+
+    thread = threading.Thread(target=_loop, name=f"periodic-{name}", daemon=True)
+    thread.start()
+    return thread
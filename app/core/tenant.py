@@ -1,10 +1,26 @@
 import json
-from datetime import datetime, timedelta
+import re
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from flask import current_app, request
 
+from app.core.cache import LocalCache, cache_available
+from app.core.finance import (
+    Ledger,
+    finance_periods,
+    finance_periods_from_totals,
+    finance_state,
+    finance_state_from_totals,
+)
+from app.core.finance_analytics import (
+    SeriesPoint,
+    finance_history,
+    history_range,
+    series_range,
+    year_over_year,
+)
 from app.core.progress import (
     mission_progress,
     mission_status,
@@ -12,10 +28,31 @@ from app.core.progress import (
     project_status,
 )
 from app.core import mysql_store
+from app.core.warmer import record_hit, warm_later
 
 Mission = Dict[str, object]
 
 
+class _FrozenDict(dict):
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Missao normalizada e somente leitura; copie antes de alterar.")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+class _FrozenList(list):
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Missao normalizada e somente leitura; copie antes de alterar.")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+
+_NORMALIZED = LocalCache()
+_SLUG_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
 def _missions_path() -> Path:
     missions_file = current_app.config.get("MISSIONS_FILE")
     return Path(missions_file)
@@ -29,13 +66,25 @@ def _is_ip_address(host: str) -> bool:
     return host.replace(".", "").isdigit()
 
 
+def _ignored_subdomains() -> set:
+    raw = current_app.config.get("IGNORED_SUBDOMAINS", "")
+    return {item.strip().lower() for item in raw.split(",") if item.strip()}
+
+
 def _extract_subdomain(host: str) -> Optional[str]:
     host = host.split(":")[0]
     if not host or _is_ip_address(host):
         return None
     if "." not in host:
         return None
-    return host.split(".")[0]
+    subdomain = host.split(".")[0]
+    if subdomain.lower() in _ignored_subdomains():
+        return None
+    return subdomain
+
+
+def is_valid_slug(slug: str) -> bool:
+    return bool(_SLUG_PATTERN.match(slug or ""))
 
 
 def _load_missions_raw() -> Dict[str, Mission]:
@@ -97,6 +146,8 @@ def _normalize_project(project: Dict[str, object]) -> Dict[str, object]:
 def _normalize_mission(slug: str, mission: Dict[str, object]) -> Mission:
     payload = dict(mission)
     payload["slug"] = slug
+    if "projects" not in payload:
+        return payload
     projects = payload.get("projects", [])
     if isinstance(projects, list):
         normalized_projects = [
@@ -111,6 +162,39 @@ def _normalize_mission(slug: str, mission: Dict[str, object]) -> Mission:
     return payload
 
 
+def _freeze(value: object) -> object:
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+    return value
+
+
+def _normalized_mission(
+    slug: str, sections: Iterable[str], loader: Callable[[int], Optional[Mission]]
+) -> Optional[Mission]:
+    config = current_app.config
+    version = mysql_store.mission_lookup(slug)
+    if version is None:
+        return None
+    memo_key = f"{slug}:v{version}:{','.join(sorted(set(sections)))}"
+    cached = _NORMALIZED.get(memo_key)
+    if cached is not None:
+        return cached
+    mission = loader(version)
+    if not mission:
+        return None
+    normalized = _freeze(_normalize_mission(slug, mission))
+    if version and cache_available():
+        _NORMALIZED.set(
+            memo_key,
+            normalized,
+            int(config.get("REDIS_TTL_MISSION", 600)),
+            int(config.get("MISSION_MEMO_SIZE", 256)),
+        )
+    return normalized
+
+
 def _parse_closed_at(value: str) -> Optional[datetime]:
     for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S UTC"):
         try:
@@ -167,12 +251,23 @@ def _set_closed_at_for_concluded(data: Dict[str, Mission]) -> bool:
     return changed
 
 
-def get_mission(slug: str) -> Optional[Mission]:
+def mission_version(slug: str) -> Optional[int]:
+    if not is_valid_slug(slug):
+        return None
+    return mysql_store.mission_lookup(slug)
+
+
+def get_mission(slug: str, sections: Iterable[str] = mysql_store.SECTIONS) -> Optional[Mission]:
+    if not is_valid_slug(slug):
+        return None
     if _use_mysql():
-        mission = mysql_store.get_mission(slug)
-        if not mission:
-            return None
-        return _normalize_mission(slug, mission)
+        sections = tuple(sections)
+        mission = _normalized_mission(
+            slug, sections, lambda version: mysql_store.get_mission(slug, sections, version)
+        )
+        if mission is not None:
+            record_hit(slug)
+        return mission
 
     missions = load_missions()
     mission = missions.get(slug)
@@ -192,21 +287,218 @@ def list_missions() -> List[Mission]:
     return sorted(payloads, key=lambda item: item.get("name", "").lower())
 
 
-def resolve_mission(slug: Optional[str] = None) -> Optional[Mission]:
+def request_subdomain() -> Optional[str]:
+    return _extract_subdomain(request.host or "")
+
+
+def resolve_mission(
+    slug: Optional[str] = None, sections: Iterable[str] = mysql_store.SECTIONS
+) -> Optional[Mission]:
     if slug:
-        return get_mission(slug)
+        return get_mission(slug, sections)
 
     host = request.host or ""
     subdomain = _extract_subdomain(host)
     if not subdomain:
         return None
 
-    return get_mission(subdomain)
+    return get_mission(subdomain, sections)
+
+
+def _conversation_from_messages(
+    mission: Mission,
+    email: str,
+    other_email: str,
+    limit: int,
+    before: Optional[mysql_store.ChatCursor],
+) -> Tuple[List[Dict[str, object]], bool]:
+    messages = mission.get("chat_messages", [])
+    if not isinstance(messages, list):
+        return [], False
+    conversation = []
+    for index, message in enumerate(messages):
+        if not isinstance(message, dict):
+            continue
+        pair = (message.get("from_email"), message.get("to_email"))
+        if pair not in {(email, other_email), (other_email, email)}:
+            continue
+        item = dict(message)
+        item.setdefault("id", index + 1)
+        position = (str(item.get("sent_at", "")), int(item["id"]))
+        if before is not None and position >= before:
+            continue
+        conversation.append((position, item))
+    conversation.sort(key=lambda pair_item: pair_item[0])
+    page = [item for _, item in conversation[-limit:]]
+    return page, len(conversation) > limit
+
+
+def list_conversation(
+    mission: Mission,
+    email: str,
+    other_email: str,
+    limit: int,
+    before: Optional[mysql_store.ChatCursor] = None,
+) -> Tuple[List[Dict[str, object]], bool]:
+    if _use_mysql():
+        result = mysql_store.list_conversation(
+            mission["id"], email, other_email, limit, before
+        )
+        return result if result is not None else ([], False)
+    return _conversation_from_messages(mission, email, other_email, limit, before)
+
+
+def _stored_reports(mission: Mission) -> List[Dict[str, object]]:
+    reports = mission.get("finance_reports", [])
+    if not isinstance(reports, list):
+        return []
+    return [
+        {**report, "id": int(report.get("id") or index + 1)}
+        for index, report in enumerate(reports)
+        if isinstance(report, dict)
+    ]
+
+
+def list_finance_reports(
+    mission: Mission, limit: int, before: Optional[mysql_store.ReportCursor] = None
+) -> Tuple[List[Dict[str, object]], bool]:
+    if _use_mysql():
+        result = mysql_store.list_finance_reports(mission["id"], limit, before)
+        return result if result is not None else ([], False)
+    positions = []
+    for report in _stored_reports(mission):
+        position = (str(report.get("created_at", "")), report["id"])
+        if before is None or position < before:
+            metadata = {key: report.get(key) for key in ("id", "created_by", "created_at")}
+            positions.append((position, metadata))
+    positions.sort(key=lambda item: item[0], reverse=True)
+    return [report for _, report in positions[:limit]], len(positions) > limit
+
+
+def get_finance_report(mission: Mission, report_id: int) -> Optional[Dict[str, object]]:
+    if _use_mysql():
+        return mysql_store.get_finance_report(mission["id"], report_id)
+    return next(
+        (report for report in _stored_reports(mission) if report["id"] == report_id), None
+    )
+
+
+def _entries_for(mission: Mission, project_ids: Optional[List[str]]) -> List[Dict[str, object]]:
+    entries = mission.get("finance_entries", [])
+    if not isinstance(entries, list):
+        return []
+    if project_ids is None:
+        return entries
+    return [
+        entry
+        for entry in entries
+        if isinstance(entry, dict)
+        and entry.get("project_id")
+        and entry.get("project_id") in project_ids
+    ]
+
+
+def list_finance_entries(
+    mission: Mission,
+    limit: int,
+    before: Optional[mysql_store.EntryCursor] = None,
+    project_ids: Optional[List[str]] = None,
+) -> Tuple[List[Dict[str, object]], bool]:
+    if _use_mysql():
+        result = mysql_store.list_finance_entries(mission["id"], limit, before, project_ids)
+        return result if result is not None else ([], False)
+    positions = []
+    for index, entry in enumerate(_entries_for(mission, None)):
+        if not isinstance(entry, dict):
+            continue
+        if project_ids is not None and entry.get("project_id") not in project_ids:
+            continue
+        position = (str(entry.get("date", "")), index + 1)
+        if before is None or position < before:
+            positions.append((position, {**entry, "id": index + 1}))
+    positions.sort(key=lambda item: item[0], reverse=True)
+    return [entry for _, entry in positions[:limit]], len(positions) > limit
+
+
+def iter_finance_entries(
+    mission: Mission,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    project_ids: Optional[List[str]] = None,
+) -> Iterator[Dict[str, object]]:
+    if _use_mysql():
+        return mysql_store.iter_finance_entries(mission["id"], start, end, project_ids)
+    start_key = start.isoformat() if start else ""
+    end_key = end.isoformat() if end else "9999-12-31"
+    entries = [
+        entry
+        for entry in _entries_for(mission, project_ids)
+        if start_key <= str(entry.get("date", "")) <= end_key
+    ]
+    return iter(sorted(entries, key=lambda entry: str(entry.get("date", ""))))
+
+
+def mission_finance_state(
+    mission: Mission,
+    projects: Iterable[Dict[str, object]],
+    project_ids: Optional[List[str]] = None,
+) -> Dict[str, object]:
+    if _use_mysql():
+        totals = mysql_store.finance_totals(mission["id"], project_ids)
+        if totals is not None:
+            return finance_state_from_totals(totals, projects)
+    return finance_state(_entries_for(mission, project_ids), projects)
+
+
+def mission_finance_periods(
+    mission: Mission, project_ids: Optional[List[str]] = None
+) -> Dict[str, Dict[str, float]]:
+    if _use_mysql():
+        now = datetime.utcnow()
+        buckets = mysql_store.finance_period_totals(mission["id"], now, project_ids)
+        if buckets is not None:
+            return finance_periods_from_totals(buckets, now)
+    return finance_periods(_entries_for(mission, project_ids))
+
+
+def mission_finance_ledger(
+    mission: Mission, start: date, end: date, project_ids: Optional[List[str]] = None
+) -> Ledger:
+    if _use_mysql():
+        rows = mysql_store.finance_daily_totals(mission["id"], start, end, project_ids)
+        if rows is not None:
+            return Ledger.from_entries(rows)
+    return Ledger.from_entries(_entries_for(mission, project_ids)).between(start, end)
+
+
+def mission_finance_history(
+    mission: Mission, project_ids: Optional[List[str]] = None
+) -> Dict[str, List[SeriesPoint]]:
+    end = datetime.utcnow().date()
+    ledger = mission_finance_ledger(mission, *history_range(end), project_ids)
+    return finance_history(ledger, end)
+
+
+def mission_finance_series(
+    mission: Mission,
+    granularity: str,
+    end: date,
+    count: int,
+    project_ids: Optional[List[str]] = None,
+) -> List[SeriesPoint]:
+    ledger = mission_finance_ledger(mission, *series_range(granularity, end, count), project_ids)
+    return year_over_year(ledger, granularity, end, count)
+
+
+def _rewarm(slug: str, written: bool) -> bool:
+    if written:
+        warm_later(slug)
+    return written
 
 
 def update_mission_meeting_link(slug: str, meeting_link: str) -> bool:
     if _use_mysql():
-        return mysql_store.update_mission_meeting_link(slug, meeting_link)
+        return _rewarm(slug, mysql_store.update_mission_meeting_link(slug, meeting_link))
 
     missions = _load_missions_raw()
     mission = missions.get(slug)
@@ -219,7 +511,8 @@ def update_mission_meeting_link(slug: str, meeting_link: str) -> bool:
 
 def update_project_meeting_link(slug: str, project_id: str, meeting_link: str) -> bool:
     if _use_mysql():
-        return mysql_store.update_project_meeting_link(slug, project_id, meeting_link)
+        updated = mysql_store.update_project_meeting_link(slug, project_id, meeting_link)
+        return _rewarm(slug, updated)
 
     missions = _load_missions_raw()
     mission = missions.get(slug)
@@ -243,7 +536,7 @@ def update_project_meeting_link(slug: str, project_id: str, meeting_link: str) -
 
 def add_finance_entry(slug: str, entry: Dict[str, object]) -> bool:
     if _use_mysql():
-        return mysql_store.add_finance_entry(slug, entry)
+        return _rewarm(slug, mysql_store.add_finance_entry(slug, entry))
 
     missions = _load_missions_raw()
     mission = missions.get(slug)
@@ -262,7 +555,7 @@ def add_finance_entry(slug: str, entry: Dict[str, object]) -> bool:
 
 def update_project_budget(slug: str, project_id: str, budget: float) -> bool:
     if _use_mysql():
-        return mysql_store.update_project_budget(slug, project_id, budget)
+        return _rewarm(slug, mysql_store.update_project_budget(slug, project_id, budget))
 
     missions = _load_missions_raw()
     mission = missions.get(slug)
@@ -0,0 +1,189 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from flask import Flask, current_app
+
+from app.core import mysql_store
+from app.core.cache import (
+    cache_get_many,
+    cache_set_nx,
+    cache_top,
+    cache_zincr_many,
+)
+
+WarmReport = Dict[str, object]
+
+HITS_KEY = "missions:hits"
+WARM_SECTIONS = ("core", "about", "help", "contact", "projects", "users")
+HITS_FLUSH_SECONDS = 10
+HITS_KEEP = 1000
+
+_HITS: Counter = Counter()
+_HITS_LOCK = threading.Lock()
+_LAST_FLUSH = time.monotonic()
+
+_QUEUE: "queue.Queue[str]" = queue.Queue()
+_WORKER_PID = None
+_WORKER_LOCK = threading.Lock()
+
+
+def _flush_hits() -> None:
+    global _LAST_FLUSH
+    with _HITS_LOCK:
+        counts = dict(_HITS)
+        _HITS.clear()
+        _LAST_FLUSH = time.monotonic()
+    cache_zincr_many(HITS_KEY, counts, HITS_KEEP)
+
+
+def record_hit(slug: str) -> None:
+    with _HITS_LOCK:
+        _HITS[slug] += 1
+        due = time.monotonic() - _LAST_FLUSH >= HITS_FLUSH_SECONDS
+    if due:
+        _flush_hits()
+
+
+def top_missions(limit: int) -> List[str]:
+    _flush_hits()
+    slugs = cache_top(HITS_KEY, limit)
+    if slugs:
+        return slugs
+    return list(mysql_store.load_missions())[:limit]
+
+
+def warm_mission(slug: str) -> bool:
+    return mysql_store.get_mission(slug, WARM_SECTIONS) is not None
+
+
+def warm_missions() -> WarmReport:
+    config = current_app.config
+    mysql_store.load_missions()
+    slugs = top_missions(int(config.get("WARM_TOP", 20)))
+    warmed = [slug for slug in slugs if warm_mission(slug)]
+    if _snapshot_path() is not None:
+        write_snapshot(warmed)
+    return {"missions": warmed}
+
+
+def _warm_loop(app: Flask) -> None:
+    while True:
+        slug = _QUEUE.get()
+        with app.app_context():
+            try:
+                warm_mission(slug)
+            except Exception:
+                app.logger.exception("Falha ao aquecer o cache da missao '%s'.", slug)
+
+
+def warm_later(slug: str) -> None:
+    global _WORKER_PID
+    if int(current_app.config.get("WARM_INTERVAL", 0)) <= 0:
+        return
+    if _WORKER_PID != os.getpid():
+        with _WORKER_LOCK:
+            if _WORKER_PID != os.getpid():
+                thread = threading.Thread(
+                    target=_warm_loop,
+                    args=(current_app._get_current_object(),),
+                    name="cache-warmer",
+                    daemon=True,
+                )
+                thread.start()
+                _WORKER_PID = os.getpid()
+    _QUEUE.put(slug)
+
+
+def _snapshot_path() -> Optional[Path]:
+    raw = current_app.config.get("CACHE_SNAPSHOT_FILE")
+    if not raw:
+        return None
+    return Path(raw)
+
+
+def _snapshot_stamp(envelope: Optional[dict]) -> str:
+    core = (envelope or {}).get("value") or {}
+    return str(core.get("updated_at") or "")
+
+
+def write_snapshot(slugs: List[str]) -> int:
+    path = _snapshot_path()
+    if path is None or not slugs:
+        return 0
+    versions = mysql_store.mission_versions(slugs)
+    keys = [
+        key
+        for slug in slugs
+        for key in mysql_store.mission_keys(slug, versions[slug], WARM_SECTIONS)
+    ]
+    entries = {
+        key: value
+        for key, value in zip(keys, cache_get_many(keys, local=False))
+        if isinstance(value, dict)
+    }
+    stamps = {
+        slug: _snapshot_stamp(entries.get(mysql_store.mission_core_key(slug, versions[slug])))
+        for slug in slugs
+    }
+    payload = {
+        "created": time.time(),
+        "versions": versions,
+        "stamps": stamps,
+        "entries": entries,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(payload), encoding="utf-8")
+    temp_path.replace(path)
+    return len(entries)
+
+
+def load_snapshot() -> int:
+    path = _snapshot_path()
+    if path is None:
+        return 0
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return 0
+    config = current_app.config
+    max_age = float(config.get("CACHE_SNAPSHOT_MAX_AGE", 900))
+    if time.time() - float(payload.get("created") or 0) > max_age:
+        return 0
+    versions: Dict[str, int] = payload.get("versions") or {}
+    stamps: Dict[str, str] = payload.get("stamps") or {}
+    counters = cache_get_many([mysql_store.mission_counter_key(slug) for slug in versions])
+    updated = mysql_store.mission_stamps(list(versions))
+    unchanged = [
+        slug
+        for (slug, version), counter in zip(versions.items(), counters)
+        if stamps.get(slug) and updated.get(slug) == stamps[slug]
+        and (counter is None or int(counter) == version)
+    ]
+    current = mysql_store.mission_versions(unchanged)
+    rekeyed = {
+        old_key: new_key
+        for slug in unchanged
+        if current.get(slug)
+        for old_key, new_key in zip(
+            mysql_store.mission_keys(slug, versions[slug], WARM_SECTIONS),
+            mysql_store.mission_keys(slug, current[slug], WARM_SECTIONS),
+        )
+    }
+    stale_ttl = int(config.get("CACHE_STALE_TTL", 60))
+    loaded = 0
+    for key, envelope in (payload.get("entries") or {}).items():
+        if key not in rekeyed or not isinstance(envelope, dict):
+            continue
+        ttl = int(float(envelope.get("expires") or 0) - time.time()) + stale_ttl
+        if ttl > 0:
+            cache_set_nx(rekeyed[key], envelope, ttl)
+            loaded += 1
+    cache_get_many(sorted(rekeyed.values()))
+    return loaded
@@ -0,0 +1,138 @@
+import hashlib
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import Blueprint, Response, current_app, request
+
+from app.core.cache import cache_available
+from app.core.tenant import get_mission, mission_version
+
+api_bp = Blueprint("api", __name__, url_prefix="/api/v1")
+
+MISSION_FIELDS = (
+    "slug",
+    "name",
+    "location",
+    "description",
+    "verse_text",
+    "verse_ref",
+    "status",
+    "progress",
+    "about",
+    "updated_at",
+)
+PROJECT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "progress",
+    "tasks_done",
+    "tasks_total",
+    "closed_at",
+)
+PROJECT_DETAIL_FIELDS = PROJECT_FIELDS + ("meeting_link", "tasks")
+
+
+def _json(payload: object, status: int = 200) -> Response:
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str)
+    return current_app.response_class(body, status=status, mimetype="application/json")
+
+
+def _not_found() -> Response:
+    return _json({"error": "nao_encontrado"}, 404)
+
+
+def _requested_fields(allowed: Tuple[str, ...]) -> Tuple[str, ...]:
+    raw = request.args.get("fields", "")
+    requested = [field.strip() for field in raw.split(",") if field.strip()]
+    if not requested:
+        return allowed
+    return tuple(field for field in requested if field in allowed)
+
+
+def _select(item: Dict[str, object], fields: Iterable[str]) -> Dict[str, object]:
+    return {field: item.get(field) for field in fields}
+
+
+def _etag(version: int) -> str:
+    raw = ":".join(
+        [
+            request.path,
+            request.query_string.decode("latin-1"),
+            str(version),
+            current_app.config.get("APP_VERSION", ""),
+        ]
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _respond(slug: str, sections: Tuple[str, ...], build) -> Response:
+    version = mission_version(slug)
+    if version is None:
+        return _not_found()
+    etag = _etag(version) if version and cache_available() else None
+    if etag and request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        mission = get_mission(slug, sections)
+        payload = build(mission) if mission else None
+        if payload is None:
+            return _not_found()
+        response = _json(payload)
+    if etag is None:
+        response.cache_control.no_cache = True
+        return response
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = int(current_app.config.get("PUBLIC_PAGE_MAX_AGE", 0))
+    response.cache_control.must_revalidate = True
+    return response
+
+
+def _projects(mission: Dict[str, object]) -> List[Dict[str, object]]:
+    return [project for project in mission.get("projects", []) if isinstance(project, dict)]
+
+
+def _find_project(mission: Dict[str, object], project_id: str) -> Optional[Dict[str, object]]:
+    return next((item for item in _projects(mission) if item.get("id") == project_id), None)
+
+
+@api_bp.get("/m/<slug>")
+def mission_detail(slug: str):
+    fields = _requested_fields(MISSION_FIELDS)
+    sections = ("about", "projects") if {"status", "progress"} & set(fields) else ("about",)
+    return _respond(slug, sections, lambda mission: _select(mission, fields))
+
+
+@api_bp.get("/m/<slug>/projetos")
+def mission_projects(slug: str):
+    fields = _requested_fields(PROJECT_FIELDS)
+    return _respond(
+        slug,
+        ("projects",),
+        lambda mission: {"projects": [_select(item, fields) for item in _projects(mission)]},
+    )
+
+
+@api_bp.get("/m/<slug>/projetos/<project_id>")
+def mission_project_detail(slug: str, project_id: str):
+    fields = _requested_fields(PROJECT_DETAIL_FIELDS)
+
+    def build(mission: Dict[str, object]) -> Optional[Dict[str, object]]:
+        project = _find_project(mission, project_id)
+        if project is None:
+            return None
+        return _select(project, fields)
+
+    return _respond(slug, ("projects",), build)
+
+
+@api_bp.get("/m/<slug>/ajuda")
+def mission_help(slug: str):
+    return _respond(slug, ("help",), lambda mission: {"help": mission.get("help", [])})
+
+
+@api_bp.get("/m/<slug>/contato")
+def mission_contact(slug: str):
+    return _respond(slug, ("contact",), lambda mission: {"contact": mission.get("contact", {})})
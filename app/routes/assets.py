@@ -0,0 +1,27 @@
+import mimetypes
+
+from flask import Blueprint, request, send_from_directory
+
+from app.core.assets import DIST_DIR, asset_max_age
+
+assets_bp = Blueprint("assets", __name__)
+
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+@assets_bp.get("/assets/<path:filename>")
+def asset(filename: str):
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    for encoding, suffix in PRECOMPRESSED:
+        if request.accept_encodings[encoding] and (DIST_DIR / (filename + suffix)).is_file():
+            response = send_from_directory(DIST_DIR, filename + suffix, mimetype=mimetype)
+            response.headers["Content-Encoding"] = encoding
+            break
+    else:
+        response = send_from_directory(DIST_DIR, filename, mimetype=mimetype)
+    response.vary.add("Accept-Encoding")
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = asset_max_age()
+    response.cache_control.immutable = True
+    return response
@@ -1,8 +1,10 @@
 from flask import Blueprint, jsonify
 
+from app.core.cache import cache_stats
+
 health_bp = Blueprint("health", __name__)
 
 
 @health_bp.get("/health")
 def health_check():
-    return jsonify(status="ok")
+    return jsonify(status="ok", cache=cache_stats())
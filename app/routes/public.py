@@ -1,24 +1,54 @@
-from typing import Optional, Tuple
+from typing import Callable, Iterable, Iterator, Optional, Tuple
 
 import csv
+import hashlib
 import io
+import json
 from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    g,
+    jsonify,
+    make_response,
+    redirect,
+    render_template,
+    request,
+    session,
+    stream_with_context,
+    url_for,
+)
 
-from flask import Blueprint, current_app, redirect, render_template, request, url_for
-
+from app.core.assets import asset_version
 from app.core.auth import get_current_user, require_login
-from app.core.finance import (
-    build_finance_entry,
-    finance_periods,
-    finance_state,
-    parse_amount,
-    sort_entries,
+from app.core.cache import cache_available, cache_get, cache_set
+from app.core.finance import build_finance_entry, parse_amount
+from app.core.finance_analytics import GRANULARITIES
+from app.core.jobs import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    build_finance_report,
+    enqueue,
+    job_status,
 )
 from app.core.feedback import save_feedback
 from app.core.tenant import (
     add_finance_entry,
-    add_finance_report,
+    get_finance_report,
+    iter_finance_entries,
+    list_conversation,
+    list_finance_entries,
+    list_finance_reports,
     list_missions,
+    mission_finance_history,
+    mission_finance_periods,
+    mission_finance_series,
+    mission_finance_state,
+    mission_version,
+    request_subdomain,
     resolve_mission,
     update_project_budget,
 )
@@ -28,14 +58,117 @@ public_bp = Blueprint("public", __name__)
 
 MissionResponse = Tuple[Optional[dict], Optional[Tuple[str, int]]]
 
+MISSION_PAGE_SECTIONS = ("about", "projects", "help")
 
-def _mission_or_404(slug: str) -> MissionResponse:
-    mission = resolve_mission(slug)
+
+def _mission_or_404(slug: str, sections: Iterable[str]) -> MissionResponse:
+    mission = resolve_mission(slug, sections)
     if mission is None:
         return None, (render_template("mission_not_found.html", slug=slug), 404)
+    g.mission_updated_at = mission.get("updated_at")
     return mission, None
 
 
+def _page_etag(slug: str, version: int) -> str:
+    raw = ":".join(
+        [
+            request.endpoint or "",
+            request.host or "",
+            request.path,
+            request.query_string.decode("latin-1"),
+            slug,
+            str(version),
+            current_app.config.get("APP_VERSION", ""),
+            asset_version(),
+        ]
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _public_cache_headers(response: Response) -> Response:
+    response.cache_control.public = True
+    response.cache_control.max_age = int(current_app.config.get("PUBLIC_PAGE_MAX_AGE", 0))
+    response.cache_control.must_revalidate = True
+    return response
+
+
+def _page_cache_enabled() -> bool:
+    return bool(current_app.config.get("PAGE_CACHE_ENABLED", True))
+
+
+def _page_ttl() -> int:
+    return int(current_app.config.get("REDIS_TTL_MISSION", 600))
+
+
+def _cached_page(key: str) -> Optional[Response]:
+    if not _page_cache_enabled():
+        return None
+    cached = cache_get(key)
+    if not isinstance(cached, dict) or "body" not in cached:
+        return None
+    response = current_app.response_class(cached["body"], mimetype="text/html")
+    g.mission_updated_at = cached.get("updated_at")
+    return response
+
+
+def _store_page(key: str, response: Response, ttl: int) -> None:
+    if not _page_cache_enabled() or response.status_code != 200 or session.modified:
+        return
+    payload = {"body": response.get_data(as_text=True), "updated_at": g.get("mission_updated_at")}
+    cache_set(key, payload, ttl)
+
+
+def _render_index_list(view: Callable, *args, **kwargs) -> Response:
+    app_version = current_app.config.get("APP_VERSION", "")
+    key = "page:index:" + hashlib.sha1(
+        f"{request.host}:{app_version}:{asset_version()}".encode("utf-8")
+    ).hexdigest()
+    response = _cached_page(key)
+    if response is None:
+        response = make_response(view(*args, **kwargs))
+        _store_page(key, response, int(current_app.config.get("PAGE_CACHE_INDEX_TTL", 60)))
+    return response
+
+
+def _conditional_page(view: Callable) -> Callable:
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        anonymous = get_current_user() is None
+        slug = kwargs.get("slug") or request_subdomain()
+        cacheable = slug and anonymous and cache_available()
+        version = mission_version(slug) if cacheable else None
+        if not version:
+            if anonymous and not slug and request.endpoint == "public.index":
+                response = _render_index_list(view, *args, **kwargs)
+            else:
+                response = make_response(view(*args, **kwargs))
+            response.vary.add("Cookie")
+            return response
+        etag = _page_etag(slug, version)
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag)
+        else:
+            key = f"page:{slug}:v{version}:{etag}"
+            response = _cached_page(key)
+            if response is None:
+                response = make_response(view(*args, **kwargs))
+                if "mission_updated_at" in g:
+                    _store_page(key, response, _page_ttl())
+            if response.status_code == 200 and "mission_updated_at" in g:
+                response.set_etag(etag)
+                updated_at = _parse_closed_at(g.get("mission_updated_at") or "")
+                if updated_at:
+                    response.last_modified = updated_at
+                response.make_conditional(request)
+        if response.get_etag()[0]:
+            _public_cache_headers(response)
+        response.vary.add("Cookie")
+        return response
+
+    return wrapper
+
+
 def _mission_user_from_session(mission: dict):
     current_user = get_current_user()
     if not current_user:
@@ -47,6 +180,36 @@ def _mission_user_from_session(mission: dict):
     return find_user_by_email(users, email)
 
 
+def _finance_reader(mission: dict):
+    forbidden = (render_template("forbidden.html", message="Acesso financeiro restrito."), 403)
+    mission_user = _mission_user_from_session(mission)
+    if not mission_user:
+        return None, forbidden
+    role = mission_user.get("role", "")
+    can_read = user_has_permission(mission_user, "finance.read") or role in {
+        "lider",
+        "voluntario",
+    }
+    if not can_read:
+        return None, forbidden
+    return mission_user, None
+
+
+def _parse_date_arg(name: str):
+    value = request.args.get(name, "").strip()
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _parse_cursor(raw: str) -> Optional[Tuple[str, int]]:
+    position, _, item_id = raw.rpartition(",")
+    if not position or not item_id.isdigit():
+        return None
+    return position, int(item_id)
+
+
 def _parse_closed_at(value: str):
     for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S UTC"):
         try:
@@ -57,9 +220,11 @@ def _parse_closed_at(value: str):
 
 
 @public_bp.get("/")
+@_conditional_page
 def index():
-    mission = resolve_mission()
+    mission = resolve_mission(sections=MISSION_PAGE_SECTIONS)
     if mission:
+        g.mission_updated_at = mission.get("updated_at")
         return render_template("mission.html", mission=mission)
 
     missions = list_missions()
@@ -67,16 +232,18 @@ def index():
 
 
 @public_bp.get("/m/<slug>")
+@_conditional_page
 def mission_by_slug(slug: str):
-    mission, not_found = _mission_or_404(slug)
+    mission, not_found = _mission_or_404(slug, MISSION_PAGE_SECTIONS)
     if not_found:
         return not_found
     return render_template("mission.html", mission=mission)
 
 
 @public_bp.get("/m/<slug>/sobre")
+@_conditional_page
 def mission_about(slug: str):
-    mission, not_found = _mission_or_404(slug)
+    mission, not_found = _mission_or_404(slug, ("about",))
     if not_found:
         return not_found
     about = mission.get("about", {})
@@ -84,18 +251,19 @@ def mission_about(slug: str):
 
 
 @public_bp.get("/m/<slug>/projetos")
+@_conditional_page
 def mission_projects(slug: str):
-    mission, not_found = _mission_or_404(slug)
+    mission, not_found = _mission_or_404(slug, ("projects",))
     if not_found:
         return not_found
-    can_write = user_has_permission(mission_user, "finance.write")
     projects = mission.get("projects", [])
     return render_template("mission_projects.html", mission=mission, projects=projects)
 
 
 @public_bp.get("/m/<slug>/projetos/<project_id>")
+@_conditional_page
 def mission_project_detail(slug: str, project_id: str):
-    mission, not_found = _mission_or_404(slug)
+    mission, not_found = _mission_or_404(slug, ("projects",))
     if not_found:
         return not_found
     projects = mission.get("projects", [])
@@ -115,7 +283,7 @@ def mission_project_detail(slug: str, project_id: str):
 
 @public_bp.get("/m/<slug>/painel")
 def mission_dashboard(slug: str):
-    mission, not_found = _mission_or_404(slug)
+    mission, not_found = _mission_or_404(slug, ("projects", "users"))
     if not_found:
         return not_found
     login_redirect = require_login(next_url=request.path)
@@ -126,8 +294,7 @@ def mission_dashboard(slug: str):
     can_view_finance = bool(mission_user and user_has_permission(mission_user, "finance.read"))
     can_write_finance = bool(mission_user and user_has_permission(mission_user, "finance.write"))
     projects = mission.get("projects", [])
-    entries = mission.get("finance_entries", [])
-    finance = finance_state(entries, projects) if can_view_finance else None
+    finance = mission_finance_state(mission, projects) if can_view_finance else None
     cutoff = datetime.utcnow() - timedelta(days=90)
     recent_closed = []
     for project in projects:
@@ -151,7 +318,7 @@ def mission_dashboard(slug: str):
 
 @public_bp.get("/m/<slug>/chat")
 def mission_chat(slug: str):
-    mission, not_found = _mission_or_404(slug)
+    mission, not_found = _mission_or_404(slug, ("users",))
     if not_found:
         return not_found
     login_redirect = require_login(next_url=request.full_path)
@@ -165,33 +332,35 @@ def mission_chat(slug: str):
     if selected_email:
         selected_user = find_user_by_email(users, selected_email)
 
-    messages = mission.get("chat_messages", [])
-    if selected_email and current_user:
-        current_email = current_user.get("email")
-        filtered = [
-            msg
-            for msg in messages
-            if isinstance(msg, dict)
-            and (
-                (msg.get("from_email") == current_email and msg.get("to_email") == selected_email)
-                or (msg.get("from_email") == selected_email and msg.get("to_email") == current_email)
-            )
-        ]
-    else:
-        filtered = []
+    messages = []
+    older_cursor = None
+    if selected_user and current_user:
+        limit = int(current_app.config.get("CHAT_PAGE_SIZE", 50))
+        messages, has_more = list_conversation(
+            mission,
+            current_user.get("email", ""),
+            selected_user.get("email", ""),
+            limit,
+            _parse_cursor(request.args.get("before", "")),
+        )
+        if has_more and messages:
+            oldest = messages[0]
+            older_cursor = f"{oldest.get('sent_at', '')},{oldest.get('id')}"
 
     return render_template(
         "mission_chat.html",
         mission=mission,
         users=users,
         selected_user=selected_user,
-        messages=filtered,
+        messages=messages,
+        older_cursor=older_cursor,
     )
 
 
 @public_bp.get("/m/<slug>/ajuda")
+@_conditional_page
 def mission_help(slug: str):
-    mission, not_found = _mission_or_404(slug)
+    mission, not_found = _mission_or_404(slug, ("help",))
     if not_found:
         return not_found
     help_items = mission.get("help", [])
@@ -199,8 +368,9 @@ def mission_help(slug: str):
 
 
 @public_bp.get("/m/<slug>/contato")
+@_conditional_page
 def mission_contact(slug: str):
-    mission, not_found = _mission_or_404(slug)
+    mission, not_found = _mission_or_404(slug, ("contact",))
     if not_found:
         return not_found
     contact = mission.get("contact", {})
@@ -209,24 +379,34 @@ def mission_contact(slug: str):
 
 @public_bp.route("/m/<slug>/financeiro", methods=["GET", "POST"])
 def mission_finance(slug: str):
-    mission, not_found = _mission_or_404(slug)
+    mission, not_found = _mission_or_404(slug, ("projects", "users"))
     if not_found:
         return not_found
     login_redirect = require_login(next_url=request.path)
     if login_redirect:
         return login_redirect
 
-    mission_user = _mission_user_from_session(mission)
-    if not mission_user:
-        return render_template("forbidden.html", message="Acesso financeiro restrito."), 403
+    mission_user, forbidden = _finance_reader(mission)
+    if forbidden:
+        return forbidden
+    if request.method == "POST" and request.form.get("action") == "export_csv":
+        return redirect(url_for("public.mission_finance_export", slug=slug))
 
     role = mission_user.get("role", "")
-    can_read = user_has_permission(mission_user, "finance.read") or role in {
-        "lider",
-        "voluntario",
-    }
-    if not can_read:
-        return render_template("forbidden.html", message="Acesso financeiro restrito."), 403
+    can_write = user_has_permission(mission_user, "finance.write")
+
+    if request.method == "POST" and request.form.get("action") == "save_report":
+        if not can_write:
+            return render_template(
+                "forbidden.html",
+                message="Sem permissao para salvar relatorio.",
+            ), 403
+        created_by = mission_user.get("email", "")
+        job_id = enqueue("finance_report", slug, created_by)
+        if job_id:
+            return redirect(url_for("public.mission_finance_job", slug=slug, job_id=job_id))
+        if build_finance_report(slug, created_by):
+            return redirect(url_for("public.mission_finance", slug=slug, saved="1"))
 
     projects = mission.get("projects", [])
     projects_by_id = {
@@ -246,83 +426,35 @@ def mission_finance(slug: str):
             if budget_value > 0:
                 budget_projects.append(project)
 
-    entries = mission.get("finance_entries", [])
-    if user_has_permission(mission_user, "finance.read"):
-        entries_filtered = entries
-    else:
-        entries_filtered = [
-            entry
-            for entry in entries
-            if isinstance(entry, dict)
-            and entry.get("project_id")
-            and entry.get("project_id") in projects_by_id
-        ]
+    project_scope = None
+    if not user_has_permission(mission_user, "finance.read"):
+        project_scope = list(projects_by_id)
 
-    entries_sorted = sort_entries(entries_filtered)
-    state = finance_state(entries_sorted, projects_by_id.values())
-    periods = finance_periods(entries_sorted)
+    entries, has_more = list_finance_entries(
+        mission,
+        int(current_app.config.get("FINANCE_PAGE_SIZE", 50)),
+        _parse_cursor(request.args.get("before", "")),
+        project_scope,
+    )
+    older_cursor = None
+    if has_more and entries:
+        oldest = entries[-1]
+        older_cursor = f"{oldest.get('date', '')},{oldest.get('id')}"
+    state = mission_finance_state(mission, projects_by_id.values(), project_scope)
+    periods = mission_finance_periods(mission, project_scope)
+    history = mission_finance_history(mission, project_scope)
 
     if request.method == "POST":
         action = request.form.get("action", "entry")
 
-        if action == "export_csv":
-            output = io.StringIO()
-            writer = csv.writer(output)
-            writer.writerow(
-                [
-                    "data",
-                    "tipo",
-                    "valor",
-                    "descricao",
-                    "categoria",
-                    "projeto",
-                    "criado_por",
-                    "criado_em",
-                ]
-            )
-            for entry in entries_sorted:
-                writer.writerow(
-                    [
-                        entry.get("date", ""),
-                        entry.get("type", ""),
-                        entry.get("amount", ""),
-                        entry.get("description", ""),
-                        entry.get("category", ""),
-                        entry.get("project_id", ""),
-                        entry.get("created_by", ""),
-                        entry.get("created_at", ""),
-                    ]
-                )
-            response = current_app.response_class(
-                output.getvalue(),
-                mimetype="text/csv",
-            )
-            response.headers["Content-Disposition"] = (
-                f"attachment; filename=financeiro-{slug}.csv"
-            )
-            return response
-
         if action == "save_report":
-            if not can_write:
-                return render_template(
-                    "forbidden.html",
-                    message="Sem permissao para salvar relatorio.",
-                ), 403
-            report = {
-                "periods": periods,
-                "state": state,
-                "created_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
-                "created_by": mission_user.get("email", ""),
-            }
-            if add_finance_report(slug, report):
-                return redirect(url_for("public.mission_finance", slug=slug, saved="1"))
             return render_template(
                 "mission_finance.html",
                 mission=mission,
-                entries=entries_sorted,
+                entries=entries,
                 state=state,
                 periods=periods,
-                can_read=can_read,
+                history=history,
                 can_write=can_write,
                 budget_projects=budget_projects,
                 error="Nao foi possivel salvar o relatorio.",
@@ -341,10 +473,10 @@ def mission_finance(slug: str):
                 return render_template(
                     "mission_finance.html",
                     mission=mission,
-                    entries=entries_sorted,
+                    entries=entries,
                     state=state,
                     periods=periods,
-                    can_read=can_read,
+                    history=history,
                     can_write=can_write,
                     budget_projects=budget_projects,
                     error="Projeto invalido.",
@@ -353,10 +485,10 @@ def mission_finance(slug: str):
                 return render_template(
                     "mission_finance.html",
                     mission=mission,
-                    entries=entries_sorted,
+                    entries=entries,
                     state=state,
                     periods=periods,
-                    can_read=can_read,
+                    history=history,
                     can_write=can_write,
                     budget_projects=budget_projects,
                     error="Informe um valor de orcamento valido.",
@@ -370,10 +502,10 @@ def mission_finance(slug: str):
                 return render_template(
                     "mission_finance.html",
                     mission=mission,
-                    entries=entries_sorted,
+                    entries=entries,
                     state=state,
                     periods=periods,
-                    can_read=can_read,
+                    history=history,
                     can_write=can_write,
                     budget_projects=budget_projects,
                     error="Orcamento acima do disponivel no caixa central.",
@@ -383,10 +515,10 @@ def mission_finance(slug: str):
             return render_template(
                 "mission_finance.html",
                 mission=mission,
-                entries=entries_sorted,
+                entries=entries,
                 state=state,
                 periods=periods,
-                can_read=can_read,
+                history=history,
                 can_write=can_write,
                 budget_projects=budget_projects,
                 error="Nao foi possivel atualizar o orcamento.",
@@ -402,10 +534,10 @@ def mission_finance(slug: str):
             return render_template(
                 "mission_finance.html",
                 mission=mission,
-                entries=entries_sorted,
+                entries=entries,
                 state=state,
                 periods=periods,
-                can_read=can_read,
+                history=history,
                 can_write=can_write,
                 budget_projects=budget_projects,
                 error=error,
@@ -418,10 +550,10 @@ def mission_finance(slug: str):
                 return render_template(
                     "mission_finance.html",
                     mission=mission,
-                    entries=entries_sorted,
+                    entries=entries,
                     state=state,
                     periods=periods,
-                    can_read=can_read,
+                    history=history,
                     can_write=can_write,
                     budget_projects=budget_projects,
                     error="Projeto invalido.",
@@ -434,10 +566,10 @@ def mission_finance(slug: str):
                 return render_template(
                     "mission_finance.html",
                     mission=mission,
-                    entries=entries_sorted,
+                    entries=entries,
                     state=state,
                     periods=periods,
-                    can_read=can_read,
+                    history=history,
                     can_write=can_write,
                     budget_projects=budget_projects,
                     error="Projeto sem orcamento definido.",
@@ -466,10 +598,10 @@ def mission_finance(slug: str):
         return render_template(
             "mission_finance.html",
             mission=mission,
-            entries=entries_sorted,
+            entries=entries,
             state=state,
             periods=periods,
-            can_read=can_read,
+            history=history,
             can_write=can_write,
             budget_projects=budget_projects,
             error="Nao foi possivel salvar o lancamento.",
@@ -479,16 +611,206 @@ def mission_finance(slug: str):
     return render_template(
         "mission_finance.html",
         mission=mission,
-        entries=entries_sorted,
+        entries=entries,
+        older_cursor=older_cursor,
         state=state,
         periods=periods,
-        can_read=can_read,
+        history=history,
         can_write=can_write,
+        can_view_reports=user_has_permission(mission_user, "finance.read"),
         budget_projects=budget_projects,
         saved=saved,
     )
 
 
+EXPORT_COLUMNS = (
+    ("data", "date"),
+    ("tipo", "type"),
+    ("valor", "amount"),
+    ("descricao", "description"),
+    ("categoria", "category"),
+    ("projeto", "project_id"),
+    ("criado_por", "created_by"),
+    ("criado_em", "created_at"),
+)
+SERIES_COLUMNS = (
+    ("periodo", "key"),
+    ("inicio", "start"),
+    ("entradas", "total_in"),
+    ("saidas", "total_out"),
+    ("saldo", "balance"),
+    ("periodo_anterior", "previous_key"),
+    ("entradas_anterior", "previous_in"),
+    ("saidas_anterior", "previous_out"),
+    ("saldo_anterior", "previous_balance"),
+)
+EXPORT_CHUNK_ROWS = 500
+SERIES_MAX_BUCKETS = 520
+
+
+def _csv_chunks(entries: Iterable[dict], columns=EXPORT_COLUMNS) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in columns])
+    for count, entry in enumerate(entries, start=1):
+        writer.writerow([entry.get(field, "") for _, field in columns])
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+def _ndjson_chunks(entries: Iterable[dict]) -> Iterator[str]:
+    lines = []
+    for entry in entries:
+        lines.append(json.dumps(entry, ensure_ascii=False, default=str))
+        if len(lines) == EXPORT_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _series_export(slug: str, mission: dict, project_scope: Optional[list]) -> Response:
+    granularity = request.args.get("granularity", "month")
+    if granularity not in GRANULARITIES:
+        return current_app.response_class("Granularidade invalida.", status=400)
+    try:
+        count = min(max(int(request.args.get("count", "12")), 1), SERIES_MAX_BUCKETS)
+    except ValueError:
+        count = 12
+    end = _parse_date_arg("end") or datetime.utcnow().date()
+    series = mission_finance_series(mission, granularity, end, count, project_scope)
+    response = current_app.response_class(
+        "".join(_csv_chunks(series, SERIES_COLUMNS)), mimetype="text/csv"
+    )
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=financeiro-{slug}-{granularity}.csv"
+    )
+    return response
+
+
+@public_bp.get("/m/<slug>/financeiro/exportar")
+def mission_finance_export(slug: str):
+    mission, not_found = _mission_or_404(slug, ("projects", "users"))
+    if not_found:
+        return not_found
+    login_redirect = require_login(next_url=request.full_path)
+    if login_redirect:
+        return login_redirect
+    mission_user, forbidden = _finance_reader(mission)
+    if forbidden:
+        return forbidden
+
+    project_scope = None
+    if not user_has_permission(mission_user, "finance.read"):
+        project_scope = [
+            project.get("id") for project in mission.get("projects", []) if project.get("id")
+        ]
+    project_id = request.args.get("project", "").strip()
+    if project_id:
+        if project_scope is None or project_id in project_scope:
+            project_scope = [project_id]
+        else:
+            project_scope = []
+
+    if request.args.get("format") == "series":
+        return _series_export(slug, mission, project_scope)
+
+    entries = iter_finance_entries(
+        mission, _parse_date_arg("start"), _parse_date_arg("end"), project_scope
+    )
+    if request.args.get("format") == "ndjson":
+        chunks, mimetype, extension = _ndjson_chunks(entries), "application/x-ndjson", "ndjson"
+    else:
+        chunks, mimetype, extension = _csv_chunks(entries), "text/csv", "csv"
+    response = current_app.response_class(stream_with_context(chunks), mimetype=mimetype)
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=financeiro-{slug}.{extension}"
+    )
+    return response
+
+
+def _finance_report_reader(slug: str):
+    mission, not_found = _mission_or_404(slug, ("users",))
+    if not_found:
+        return None, not_found
+    login_redirect = require_login(next_url=request.full_path)
+    if login_redirect:
+        return None, login_redirect
+    mission_user, forbidden = _finance_reader(mission)
+    if forbidden:
+        return None, forbidden
+    if not user_has_permission(mission_user, "finance.read"):
+        return None, (
+            render_template("forbidden.html", message="Acesso financeiro restrito."),
+            403,
+        )
+    return mission, None
+
+
+@public_bp.get("/m/<slug>/financeiro/relatorios")
+def mission_finance_reports(slug: str):
+    mission, denied = _finance_report_reader(slug)
+    if denied:
+        return denied
+    limit = int(current_app.config.get("REPORTS_PAGE_SIZE", 20))
+    reports, has_more = list_finance_reports(
+        mission, limit, _parse_cursor(request.args.get("before", ""))
+    )
+    older_cursor = None
+    if has_more and reports:
+        oldest = reports[-1]
+        older_cursor = f"{oldest.get('created_at', '')},{oldest.get('id')}"
+    return render_template(
+        "mission_finance_reports.html",
+        mission=mission,
+        reports=reports,
+        older_cursor=older_cursor,
+    )
+
+
+@public_bp.get("/m/<slug>/financeiro/relatorios/<int:report_id>")
+def mission_finance_report(slug: str, report_id: int):
+    mission, denied = _finance_report_reader(slug)
+    if denied:
+        return denied
+    report = get_finance_report(mission, report_id)
+    if report is None:
+        return render_template("mission_not_found.html", slug=slug), 404
+    return render_template("mission_finance_report.html", mission=mission, report=report)
+
+
+@public_bp.get("/m/<slug>/financeiro/tarefas/<job_id>")
+def mission_finance_job(slug: str, job_id: str):
+    mission, not_found = _mission_or_404(slug, ("users",))
+    if not_found:
+        return not_found
+    login_redirect = require_login(next_url=request.full_path)
+    if login_redirect:
+        return login_redirect
+    _, forbidden = _finance_reader(mission)
+    if forbidden:
+        return forbidden
+    job = job_status(job_id)
+    if job is None or job.get("slug") != slug:
+        return render_template("mission_not_found.html", slug=slug), 404
+    if request.args.get("format") == "json":
+        return jsonify(
+            {
+                key: job.get(key)
+                for key in ("id", "type", "status", "error", "created_at", "finished_at")
+            }
+        )
+    return render_template(
+        "mission_finance_job.html",
+        mission=mission,
+        job=job,
+        finished=job.get("status") in {STATUS_DONE, STATUS_FAILED},
+    )
+
+
 @public_bp.route("/feedback", methods=["GET", "POST"])
 def feedback():
     current_user = get_current_user()
@@ -1,6 +1,7 @@
 import json
 import time
 from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
@@ -9,7 +10,14 @@ from flask import current_app
 from app.config import BASE_DIR
 from app.core.cache import cache_delete, cache_get, cache_set
 from app.core.db import get_connection
-from app.core.tenant import get_mission, list_missions
+from app.core.finance import ENTRY_TYPE_IN, finance_periods, finance_state
+from app.core.tenant import (
+    get_mission,
+    list_missions,
+    mission_finance_periods,
+    mission_finance_series,
+    mission_finance_state,
+)
 
 
 def _write_report(report: Dict[str, object]) -> None:
@@ -36,7 +44,7 @@ def _check_mysql(errors: List[str]) -> None:
 def _check_redis(errors: List[str]) -> None:
     try:
         cache_set("test:ping", {"ok": True}, 5)
-        payload = cache_get("test:ping")
+        payload = cache_get("test:ping", local=False)
         if not payload or not payload.get("ok"):
             _record_error(errors, "Redis nao respondeu corretamente.")
         cache_delete("test:ping")
@@ -55,6 +63,89 @@ def _check_missions(errors: List[str]) -> None:
         _record_error(errors, f"Missao '{slug}' nao encontrada.")
 
 
+def _same_numbers(expected: object, actual: object) -> bool:
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return expected.keys() == actual.keys() and all(
+            _same_numbers(expected[key], actual[key]) for key in expected
+        )
+    if isinstance(expected, list) and isinstance(actual, list):
+        return len(expected) == len(actual) and all(
+            _same_numbers(left, right) for left, right in zip(expected, actual)
+        )
+    if isinstance(expected, float) or isinstance(actual, float):
+        try:
+            return abs(float(expected) - float(actual)) < 0.005
+        except (TypeError, ValueError):
+            return False
+    return expected == actual
+
+
+def _check_finance_aggregates(errors: List[str]) -> None:
+    slug = current_app.config.get("TEST_MISSION_SLUG", "teste")
+    mission = get_mission(slug, ("projects", "finance"))
+    if not mission:
+        return
+    projects = [project for project in mission.get("projects", []) if project.get("id")]
+    entries = mission.get("finance_entries", [])
+    project_ids = [project["id"] for project in projects]
+    scoped_entries = [entry for entry in entries if entry.get("project_id") in project_ids]
+    for scope, scope_entries in ((None, entries), (project_ids, scoped_entries)):
+        if not _same_numbers(
+            finance_state(scope_entries, projects),
+            mission_finance_state(mission, projects, scope),
+        ):
+            _record_error(errors, "Totais financeiros do MySQL divergem da referencia.")
+        if not _same_numbers(
+            finance_periods(scope_entries),
+            mission_finance_periods(mission, scope),
+        ):
+            _record_error(errors, "Periodos financeiros do MySQL divergem da referencia.")
+
+
+def _check_finance_series(errors: List[str]) -> None:
+    slug = current_app.config.get("TEST_MISSION_SLUG", "teste")
+    mission = get_mission(slug, ("projects", "finance"))
+    if not mission:
+        return
+    today = datetime.utcnow().date()
+    series = mission_finance_series(mission, "month", today, 12)
+    expected = {}
+    for entry in mission.get("finance_entries", []):
+        month = str(entry.get("date", ""))[:7]
+        totals = expected.setdefault(month, {"total_in": 0.0, "total_out": 0.0})
+        field = "total_in" if entry.get("type") == ENTRY_TYPE_IN else "total_out"
+        totals[field] += float(entry.get("amount") or 0)
+    for point in series:
+        for key, prefix in ((point["key"], "total"), (point["previous_key"], "previous")):
+            totals = expected.get(key, {"total_in": 0.0, "total_out": 0.0})
+            actual = {
+                "total_in": point[f"{prefix}_in"],
+                "total_out": point[f"{prefix}_out"],
+            }
+            if not _same_numbers(totals, actual):
+                _record_error(errors, f"Serie financeira diverge da referencia em {key}.")
+                return
+
+
+def _check_api(errors: List[str]) -> None:
+    slug = current_app.config.get("TEST_MISSION_SLUG", "teste")
+    client = current_app.test_client()
+    response = client.get(f"/api/v1/m/{slug}?fields=slug,name")
+    payload = response.get_json(silent=True) or {}
+    if response.status_code != 200 or payload.get("slug") != slug or set(payload) != {
+        "slug",
+        "name",
+    }:
+        _record_error(errors, "API /api/v1/m/<slug> nao respondeu com os campos pedidos.")
+        return
+    cached = client.get(
+        f"/api/v1/m/{slug}?fields=slug,name",
+        headers={"If-None-Match": response.headers.get("ETag", "")},
+    )
+    if cached.status_code != 304:
+        _record_error(errors, "API nao respondeu 304 para ETag igual.")
+
+
 def _load_test(errors: List[str]) -> float:
     slug = current_app.config.get("TEST_MISSION_SLUG", "teste")
     iterations = int(current_app.config.get("LOAD_TEST_ITERATIONS", 200))
@@ -81,6 +172,9 @@ def run_tests() -> Dict[str, object]:
     _check_mysql(errors)
     _check_redis(errors)
     _check_missions(errors)
+    _check_finance_aggregates(errors)
+    _check_finance_series(errors)
+    _check_api(errors)
     load_time = _load_test(errors)
     report = {
         "errors": errors,
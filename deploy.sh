@@ -21,6 +21,13 @@ if [ ! -f ".env" ]; then
   cp .env.example .env
 fi
 
+python app.py --build-assets
+python app.py --compile-templates
+
+if [ "${JOBS_ENABLED:-0}" = "1" ]; then
+  python app.py --worker &
+fi
+
 if [ "${USE_GUNICORN:-0}" = "1" ]; then
   exec gunicorn -c gunicorn.conf.py app:app
 fi
@@ -6,3 +6,9 @@ threads = int(os.getenv("GUNICORN_THREADS", "4"))
 timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
 accesslog = "-"
 errorlog = "-"
+
+
+def post_worker_init(worker):
+    from app.app import start_background_tasks
+
+    start_background_tasks(worker.wsgi)
@@ -6,7 +6,8 @@ CREATE TABLE missions (
   description TEXT,
   verse_text TEXT,
   verse_ref VARCHAR(255),
-  meeting_link VARCHAR(255)
+  meeting_link VARCHAR(255),
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 );
 
 CREATE INDEX idx_missions_slug ON missions (slug);
@@ -111,6 +112,7 @@ CREATE TABLE chat_messages (
 );
 
 CREATE INDEX idx_chat_mission ON chat_messages (mission_id);
+CREATE INDEX idx_chat_conversation ON chat_messages (mission_id, from_email, to_email, sent_at);
 
 CREATE TABLE finance_entries (
   id INT AUTO_INCREMENT PRIMARY KEY,
@@ -129,6 +131,27 @@ CREATE TABLE finance_entries (
 
 CREATE INDEX idx_finance_mission ON finance_entries (mission_id);
 CREATE INDEX idx_finance_project ON finance_entries (project_key);
+CREATE INDEX idx_finance_mission_date ON finance_entries (mission_id, date);
+CREATE INDEX idx_finance_aggregate ON finance_entries (mission_id, type, project_key, date);
+
+CREATE TABLE finance_ledger_totals (
+  mission_id INT NOT NULL,
+  project_key VARCHAR(64) NOT NULL DEFAULT '',
+  type VARCHAR(16) NOT NULL DEFAULT '',
+  total DECIMAL(14, 2) NOT NULL DEFAULT 0,
+  PRIMARY KEY (mission_id, project_key, type),
+  FOREIGN KEY (mission_id) REFERENCES missions(id) ON DELETE CASCADE
+);
+
+CREATE TABLE finance_ledger_daily (
+  mission_id INT NOT NULL,
+  day DATE NOT NULL,
+  project_key VARCHAR(64) NOT NULL DEFAULT '',
+  type VARCHAR(16) NOT NULL DEFAULT '',
+  total DECIMAL(14, 2) NOT NULL DEFAULT 0,
+  PRIMARY KEY (mission_id, day, project_key, type),
+  FOREIGN KEY (mission_id) REFERENCES missions(id) ON DELETE CASCADE
+);
 
 CREATE TABLE finance_reports (
   id INT AUTO_INCREMENT PRIMARY KEY,
@@ -139,7 +162,7 @@ CREATE TABLE finance_reports (
   FOREIGN KEY (mission_id) REFERENCES missions(id) ON DELETE CASCADE
 );
 
-CREATE INDEX idx_reports_mission ON finance_reports (mission_id);
+CREATE INDEX idx_reports_mission ON finance_reports (mission_id, created_at, id);
 
 INSERT INTO missions (slug, name, location, description, verse_text, verse_ref, meeting_link) VALUES
   ('ide', 'Ide e Pregai', 'Global', 'Plataforma para tornar visivel o evangelho em movimento.', 'Ide por todo o mundo e pregai o evangelho a toda criatura.', 'Marcos 16:15', NULL),
@@ -209,3 +232,15 @@ INSERT INTO chat_messages (mission_id, from_email, from_name, to_email, message,
 INSERT INTO finance_entries (mission_id, date, type, amount, description, category, receipt_link, project_key, created_by, created_at) VALUES
   (3, '2024-01-10', 'entrada', 1500, 'Oferta mensal da igreja', 'Doacoes', '', NULL, 'fabi.financeiro@missao-teste.org', '2024-01-10 09:00:00 UTC'),
   (3, '2024-01-12', 'saida', 420, 'Material para projeto piloto', 'Recursos', 'https://exemplo.org/comprovante/123', 'projeto-piloto', 'fabi.financeiro@missao-teste.org', '2024-01-12 15:20:00 UTC');
+
+INSERT INTO finance_ledger_totals (mission_id, project_key, type, total)
+SELECT mission_id, COALESCE(project_key, ''), COALESCE(type, ''), SUM(amount)
+FROM finance_entries
+WHERE amount IS NOT NULL
+GROUP BY mission_id, COALESCE(project_key, ''), COALESCE(type, '');
+
+INSERT INTO finance_ledger_daily (mission_id, day, project_key, type, total)
+SELECT mission_id, date, COALESCE(project_key, ''), COALESCE(type, ''), SUM(amount)
+FROM finance_entries
+WHERE amount IS NOT NULL AND date IS NOT NULL
+GROUP BY mission_id, date, COALESCE(project_key, ''), COALESCE(type, '');